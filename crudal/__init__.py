@@ -1,2 +1,5 @@
+from crudal.advisor import IndexAdvisor
 from crudal.base_async import DeclarativeCrudBaseAsync
 from crudal.base_sync import DeclarativeCrudBase
+from crudal.pool import pool_stats, warmup, warmup_async
+from crudal.unit_of_work import batch
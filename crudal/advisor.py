@@ -0,0 +1,184 @@
+import typing as t
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from inspect import (
+    Parameter,
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isgeneratorfunction,
+    signature,
+)
+
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy.inspection import inspect
+
+# advisors active in current thread / task
+_advisors: ContextVar[t.Tuple["IndexAdvisor", ...]] = ContextVar(
+    "crudal_index_advisors", default=()
+)
+# set while advisable operation runs, operations called by it are not recorded
+_running: ContextVar[bool] = ContextVar("crudal_advisable_running", default=False)
+
+
+class IndexSuggestion(t.NamedTuple):
+    """Filter columns combination queried without usable index"""
+
+    model: type
+    columns: t.Tuple[str, ...]
+    count: int
+
+
+def record_filters(cls, filters: t.Mapping[str, t.Any]) -> None:
+    """Pass filter keys of crudal operation to active advisors"""
+    advisors = _advisors.get()
+    if not advisors or not filters:
+        return
+
+    entity = cls[0] if isinstance(cls, (list, tuple)) else cls
+    model = getattr(entity, "class_", entity)
+    for advisor in advisors:
+        advisor.record(model, filters)
+
+
+def advisable(
+    f: t.Optional[t.Callable] = None, *, fields: t.Optional[str] = None
+) -> t.Any:
+    """Decorator to record filters of operation once per call.
+
+    Filters are keyword arguments which are not named parameters of operation,
+    or key columns passed in `fields` argument (like `columns` of `exists_many`).
+    Operations called by advisable operation (like `exists` by `delete`)
+    are not recorded.
+    """
+    if f is None:
+        return lambda f: advisable(f, fields=fields)
+
+    named = {
+        name
+        for name, param in signature(f).parameters.items()
+        if param.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+    }
+
+    def record(args: t.Tuple[t.Any, ...], kwargs: t.Dict[str, t.Any]) -> None:
+        if not _advisors.get() or _running.get():
+            return
+        if fields is None:
+            filters = {k: v for k, v in kwargs.items() if k not in named}
+        else:
+            keys = kwargs.get(fields) or ()
+            filters = dict.fromkeys([keys] if isinstance(keys, str) else keys)
+        record_filters(args[0], filters)
+
+    if isasyncgenfunction(f):
+
+        @wraps(f)
+        async def agen_wrapper(*args, **kwargs):
+            record(args, kwargs)
+            async for item in f(*args, **kwargs):
+                yield item
+
+        return agen_wrapper
+
+    if isgeneratorfunction(f):
+
+        @wraps(f)
+        def gen_wrapper(*args, **kwargs):
+            record(args, kwargs)
+            yield from f(*args, **kwargs)
+
+        return gen_wrapper
+
+    if iscoroutinefunction(f):
+
+        @wraps(f)
+        async def async_wrapper(*args, **kwargs):
+            record(args, kwargs)
+            token = _running.set(True)
+            try:
+                return await f(*args, **kwargs)
+            finally:
+                _running.reset(token)
+
+        return async_wrapper
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        record(args, kwargs)
+        token = _running.set(True)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            _running.reset(token)
+
+    return wrapper
+
+
+def _leading_columns(table) -> t.Set[str]:
+    """Columns that can be used to search by some table index"""
+    leading = set()
+    for index in table.indexes:
+        columns = list(index.columns)
+        if columns:
+            leading.add(columns[0].name)
+
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+            columns = list(constraint.columns)
+            if columns:
+                leading.add(columns[0].name)
+
+    return leading
+
+
+class IndexAdvisor:
+    """Record which filter combinations crudal models are queried with.
+
+    Recording is active inside `with` block. `report()` returns combinations
+    that no index of `__table__` can serve, so the database has to scan
+    the whole table for them. Every operation is counted once (`explain`
+    is not counted). Only operations called in current thread or task
+    (and tasks created inside the block) are recorded.
+
+    Example:
+    ```
+    with IndexAdvisor() as advisor:
+        run_workload()
+
+    for suggestion in advisor.report():
+        print(suggestion.model.__name__, suggestion.columns, suggestion.count)
+    ```
+    """
+
+    def __init__(self):
+        self.counts: t.Counter[t.Tuple[type, t.FrozenSet[str]]] = Counter()
+
+    def __enter__(self) -> "IndexAdvisor":
+        self._token = _advisors.set(_advisors.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _advisors.reset(self._token)
+
+    def record(self, model: type, filters: t.Mapping[str, t.Any]) -> None:
+        """Count filter keys combination of model"""
+        column_attrs = inspect(model).column_attrs
+        columns = frozenset(
+            column_attrs[key].columns[0].name for key in filters if key in column_attrs
+        )
+        if columns:
+            self.counts[(model, columns)] += 1
+
+    def report(self) -> t.List[IndexSuggestion]:
+        """Return filter combinations without usable index, most frequent first"""
+        suggestions = []
+        for (model, columns), count in self.counts.most_common():
+            if columns & _leading_columns(model.__table__):
+                continue
+            suggestions.append(
+                IndexSuggestion(
+                    model=model, columns=tuple(sorted(columns)), count=count
+                )
+            )
+
+        return suggestions
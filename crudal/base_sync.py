@@ -1,12 +1,29 @@
+import os
+import random
 import typing as t
+from itertools import starmap
 
-from sqlalchemy import Result, ScalarResult
+from sqlalchemy import Result, ScalarResult, Table
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import DeclarativeBase, Session
 
-from crudal import operations
+from crudal import (
+    changes,
+    columnar,
+    export,
+    ingest,
+    operations,
+    records,
+    sampling,
+    serialize,
+    sharding,
+)
+from crudal.advisor import advisable
+from crudal.exceptions import VersionConflictError
 from crudal.types import CRUDALType
-from crudal.utils import with_session_sync
+from crudal.unit_of_work import batchable_sync
+from crudal.utils import chunks, with_session_sync, with_session_sync_iter
 
 _T = t.TypeVar("_T", bound=CRUDALType)
 
@@ -19,8 +36,24 @@ def _crud_stmt_execute(stmt, session: Session) -> Result:
     return session.execute(stmt)
 
 
+def _crud_stmt_execute_many(
+    stmt, params: t.Union[dict, t.List[dict]], session: Session
+) -> Result:
+    return session.execute(stmt, params)
+
+
+def _crud_stmt_stream(stmt, session: Session, batch_size: int) -> Result:
+    return session.execute(stmt, execution_options={"yield_per": batch_size})
+
+
 class DeclarativeCrudBase(DeclarativeBase):
     __session__ = None
+    __version_column__: t.Optional[str] = None
+    __watermark_column__: t.Optional[str] = None
+    __tombstones__: t.Optional[Table] = None
+    __shards__: t.Optional[sharding.ShardSet] = None
+    __timeout__: t.Optional[float] = None
+    __search_columns__: t.Optional[t.Sequence[str]] = None
 
     @classmethod
     def _get_primary_key(cls):
@@ -28,6 +61,7 @@ class DeclarativeCrudBase(DeclarativeBase):
         return inspect(cls).primary_key[0].name
 
     @classmethod
+    @advisable
     @with_session_sync
     def find(
         cls: t.Type[_T],
@@ -36,6 +70,8 @@ class DeclarativeCrudBase(DeclarativeBase):
         *,
         rows: t.Optional[int] = None,
         offset: int = 0,
+        order_by: t.Optional[operations.OrderBy] = None,
+        readonly: bool = False,
         **filters,
     ) -> t.Sequence[_T]:
         """Find items in table.
@@ -44,25 +80,100 @@ class DeclarativeCrudBase(DeclarativeBase):
         ```
         # find all users with name Andrew
         User.find(session=session, name="Andrew")
+        # latest 20 users
+        User.find(session=session, rows=20, order_by="-id")
         ```
 
         Args:
             session (Session): SQLAlchemy session
             rows(int, optional): Number of rows to return. Defaults to None.
             offset(int, optional): Number of rows to skip. Defaults to 0.
+            order_by (t.Optional[operations.OrderBy], optional): fields to sort by,
+                "-field" (or "field desc") for descending order, optionally with
+                "nulls first" / "nulls last". Defaults to None.
+            readonly (bool, optional): return immutable records, not attached
+                to session, instead of ORM objects. Defaults to False.
             **filters: search filters
 
         Returns:
             t.Sequence[_T]: Found items
         """
-        stmt = operations.find(cls, offset=offset, rows=rows, **filters)
+        if readonly:
+            return cls._find_readonly(
+                session, offset=offset, rows=rows, order_by=order_by, **filters
+            )
+
+        stmt = operations.find(
+            cls, offset=offset, rows=rows, order_by=order_by, **filters
+        )
         result = _crud_stmt_scalars(stmt, session=session)
         return result.all()
 
+    @classmethod
+    def _find_readonly(
+        cls, session: Session, /, **find_kwargs
+    ) -> t.List[records.ReadonlyRecord]:
+        record_cls = records.record_class(cls)
+        stmt = operations.find(list(record_cls._columns), **find_kwargs)
+        result = _crud_stmt_execute(stmt, session=session)
+        return list(starmap(record_cls, result))
+
+    @classmethod
+    @advisable
+    @with_session_sync_iter
+    def find_iter(
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        rows: t.Optional[int] = None,
+        offset: int = 0,
+        order_by: t.Optional[operations.OrderBy] = None,
+        readonly: bool = False,
+        batch_size: int = 1000,
+        **filters,
+    ) -> t.Iterator[_T]:
+        """Iterate over found items, fetching them from database in batches.
+
+        Example:
+        ```
+        for user in User.find_iter(session, order_by="name", name="Andrew"):
+            print(user.id)
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            rows(int, optional): Number of rows to return. Defaults to None.
+            offset(int, optional): Number of rows to skip. Defaults to 0.
+            order_by (t.Optional[operations.OrderBy], optional): fields
+                to sort by, see `find`. Defaults to None.
+            readonly (bool, optional): yield immutable records instead
+                of ORM objects. Defaults to False.
+            batch_size (int, optional): Number of rows fetched at once.
+                Defaults to 1000.
+            **filters: search filters
+
+        Yields:
+            _T: Found items
+        """
+        find_kwargs = dict(offset=offset, rows=rows, order_by=order_by, **filters)
+        if readonly:
+            record_cls = records.record_class(cls)
+            stmt = operations.find(list(record_cls._columns), **find_kwargs)
+            result = _crud_stmt_stream(stmt, session=session, batch_size=batch_size)
+            for partition in result.partitions():
+                yield from starmap(record_cls, partition)
+            return
+
+        stmt = operations.find(cls, **find_kwargs)
+        result = _crud_stmt_stream(stmt, session=session, batch_size=batch_size)
+        for partition in result.scalars().partitions():
+            yield from partition
+
     @classmethod
     @with_session_sync
     def find_by_pk(
-        cls: t.Type[_T], session: Session, /, *, pk: t.Any
+        cls: t.Type[_T], session: Session, /, *, pk: t.Any, readonly: bool = False
     ) -> t.Optional[_T]:
         """Find row by its primary key
 
@@ -75,6 +186,8 @@ class DeclarativeCrudBase(DeclarativeBase):
         Args:
             session (Session): SQLAlchemy session
             pk (t.Any): primary key value
+            readonly (bool, optional): return immutable record instead
+                of ORM object. Defaults to False.
 
         Raises:
             ValueError: Multiple rows found by one primary key
@@ -84,7 +197,7 @@ class DeclarativeCrudBase(DeclarativeBase):
                 If None - no items with such primary keys exists
         """
         pk_col = cls._get_primary_key()
-        result = cls.find(session, **{pk_col: pk})
+        result = cls.find(session, readonly=readonly, **{pk_col: pk})
         if len(result) == 1:
             return result[0]
         elif len(result) > 1:
@@ -95,6 +208,7 @@ class DeclarativeCrudBase(DeclarativeBase):
             return None
 
     @classmethod
+    @advisable
     @with_session_sync
     def exists(cls, session: Session, /, **filters) -> bool:
         """Check if items exists in table
@@ -117,27 +231,575 @@ class DeclarativeCrudBase(DeclarativeBase):
         return True if result.first() is not None else False
 
     @classmethod
+    @advisable(fields="columns")
     @with_session_sync
-    def all(cls: t.Type[_T], session: Session, /) -> t.Sequence[_T]:
+    def exists_many(
+        cls,
+        session: Session,
+        /,
+        *,
+        columns: t.Union[str, t.Sequence[str]],
+        values: t.Iterable[t.Any],
+        chunk_size: int = 1000,
+    ) -> t.Set[t.Any]:
+        """Check which of many keys exist in table
+
+        Keys are checked with one `IN` query per `chunk_size` keys. For
+        multiple columns keys are tuples compared with row value `IN`.
+
+        Example:
+        ```
+        # which of these names are taken
+        User.exists_many(session, columns="name", values=["Andrew", "Bob"])
+        # {'Andrew'}
+
+        User.exists_many(
+            session, columns=["name", "city"], values=[("Andrew", "London")]
+        )
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            columns (t.Union[str, t.Sequence[str]]): key column or columns
+            values (t.Iterable[t.Any]): key values, tuples for multiple columns
+            chunk_size (int, optional): Number of keys per query.
+                Defaults to 1000.
+
+        Raises:
+            ValueError: key column is not a mapped column
+
+        Returns:
+            t.Set[t.Any]: existing key values
+        """
+        single = isinstance(columns, str)
+        fields = [columns] if single else list(columns)
+        # validate fields even if there are no keys to query
+        columnar.resolve_columns(cls, fields)
+        keys = list(dict.fromkeys(values))
+
+        found = set()
+        for chunk in chunks(keys, chunk_size):
+            stmt = operations.exists_many_(cls, fields, chunk)
+            result = _crud_stmt_execute(stmt, session=session)
+            if single:
+                found.update(row[0] for row in result)
+            else:
+                found.update(tuple(row) for row in result)
+
+        return found
+
+    @classmethod
+    @with_session_sync
+    def search(
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        query: str,
+        rows: t.Optional[int] = None,
+        offset: int = 0,
+        prefix: bool = False,
+    ) -> t.Sequence[_T]:
+        """Full-text search in `__search_columns__`, most relevant items first.
+
+        Needs index created by `create_search_index`
+        (SQLite FTS5 or PostgreSQL tsvector).
+
+        Example:
+        ```
+        class User(DeclarativeCrudBase):
+            __tablename__ = "person"
+            __search_columns__ = ("name", "bio")
+            ...
+
+        User.create_search_index(session, commit=True)
+        User.search(session, query="andrew", rows=20)
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            query (str): words to search, all of them should match
+            rows (int, optional): Number of rows to return. Defaults to None.
+            offset (int, optional): Number of rows to skip. Defaults to 0.
+            prefix (bool, optional): match words starting with query words.
+                Defaults to False.
+
+        Returns:
+            t.Sequence[_T]: Found items
+        """
+        dialect = session.get_bind().dialect
+        stmt = operations.search_(
+            cls, dialect, query, rows=rows, offset=offset, prefix=prefix
+        )
+        result = _crud_stmt_scalars(stmt, session=session)
+        return result.all()
+
+    @classmethod
+    @with_session_sync
+    def create_search_index(cls, session: Session, /, *, commit: bool = False) -> None:
+        """Create full-text search index of `__search_columns__`.
+
+        SQLite: FTS5 table kept in sync by triggers, existing rows are indexed.
+        PostgreSQL: generated tsvector column with GIN index.
+
+        Args:
+            session (Session): SQLAlchemy session
+            commit (bool, optional): commit. Defaults to False.
+        """
+        dialect = session.get_bind().dialect
+        connection = session.connection()
+        for sql in operations.search_index_(cls, dialect):
+            connection.exec_driver_sql(sql)
+
+        if commit:
+            session.commit()
+
+    @classmethod
+    @with_session_sync
+    def rebuild_search_index(cls, session: Session, /, *, commit: bool = False) -> None:
+        """Rebuild full-text search index (after bulk loads bypassing triggers).
+
+        Args:
+            session (Session): SQLAlchemy session
+            commit (bool, optional): commit. Defaults to False.
+        """
+        dialect = session.get_bind().dialect
+        connection = session.connection()
+        for sql in operations.search_rebuild_(cls, dialect):
+            connection.exec_driver_sql(sql)
+
+        if commit:
+            session.commit()
+
+    @classmethod
+    @with_session_sync
+    def explain(
+        cls,
+        session: Session,
+        /,
+        *,
+        op: str = "find",
+        values: t.Optional[dict] = None,
+        **filters,
+    ) -> t.List[str]:
+        """Return database query plan of crudal operation.
+
+        Runs `EXPLAIN QUERY PLAN` on SQLite and `EXPLAIN` on PostgreSQL
+        and MySQL for the statement crudal builds for given filters.
+
+        Example:
+        ```
+        # check if search by name uses index
+        User.explain(session, name="Andrew")
+        # ['SCAN person']
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            op (str, optional): "find", "exists", "update" or "delete".
+                Defaults to "find".
+            values (dict, optional): values of "update" operation.
+                Defaults to None.
+            **filters: search filters
+
+        Returns:
+            t.List[str]: query plan lines
+        """
+        dialect = session.get_bind().dialect
+        sql, params = operations.explain_(cls, dialect, op=op, values=values, **filters)
+        result = session.connection().exec_driver_sql(sql, params)
+        return operations.plan_lines(dialect, result.all())
+
+    @classmethod
+    @with_session_sync
+    def all(
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        order_by: t.Optional[operations.OrderBy] = None,
+        readonly: bool = False,
+    ) -> t.Sequence[_T]:
         """Get all table items
 
         Example:
         ```
         # get all users
-        User.all(session)
+        User.all(session, order_by="name")
         ```
 
         Args:
             session (Session): SQLAlchemy session
+            order_by (t.Optional[operations.OrderBy], optional): fields
+                to sort by, see `find`. Defaults to None.
+            readonly (bool, optional): return immutable records instead
+                of ORM objects. Defaults to False.
 
         Returns:
             t.Sequence[_T]: Found items
         """
-        stmt = operations.find(cls)
+        if readonly:
+            return cls._find_readonly(session, order_by=order_by)
+
+        stmt = operations.find(cls, order_by=order_by)
         result = _crud_stmt_scalars(stmt, session=session)
         return result.all()
 
     @classmethod
+    @advisable
+    @with_session_sync
+    @sharding.no_scatter
+    def sample(
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        n: int,
+        seed: t.Optional[int] = None,
+        **filters,
+    ) -> t.List[_T]:
+        """Return `n` random items (or less, if there are not enough).
+
+        Strategy depends on database: `TABLESAMPLE` on PostgreSQL,
+        random probing of integer primary key range on others. If they
+        can't find enough rows (too selective filters, sparse keys),
+        all found rows are scanned with reservoir sampling.
+
+        Example:
+        ```
+        # the same 100 random users on every call
+        User.sample(session, n=100, seed=42, name="Andrew")
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            n (int): Number of items
+            seed (t.Optional[int], optional): random seed for reproducible
+                samples. Defaults to None.
+            **filters: search filters
+
+        Returns:
+            t.List[_T]: random items in random order
+        """
+        if n <= 0:
+            return []
+
+        rng = random.Random(seed)
+        dialect = session.get_bind().dialect
+        pk = sampling.integer_pk(cls)
+
+        if dialect.name == "postgresql":
+            stmt = operations.row_estimate_(cls)
+            estimate = _crud_stmt_execute(stmt, session=session).scalar()
+            if estimate and estimate > 0:
+                percent = sampling.tablesample_percent(estimate, n)
+                stmt = operations.tablesample_(cls, percent, seed=seed, **filters)
+                items = _crud_stmt_scalars(stmt, session=session).all()
+                if len(items) >= n:
+                    return rng.sample(list(items), n)
+
+        elif pk is not None:
+            stmt = operations.pk_range_(cls, pk)
+            low, high = _crud_stmt_execute(stmt, session=session).one()
+            if low is None:
+                return []
+
+            found: t.Dict[int, _T] = {}
+            probed: t.List[int] = []
+            seen: t.Set[int] = set()
+            for _ in range(sampling.PROBE_ROUNDS):
+                count = sampling.probe_count(n - len(found), len(seen), len(found))
+                ids = sampling.probe_ids(rng, low, high, count, seen)
+                if not ids:
+                    break
+                probed.extend(ids)
+                for chunk in chunks(ids, 1000):
+                    stmt = operations.sample_probe_(cls, pk, chunk, **filters)
+                    for item in _crud_stmt_scalars(stmt, session=session):
+                        found[getattr(item, pk)] = item
+                if len(found) >= n:
+                    break
+
+            if len(found) >= n or len(seen) == high - low + 1:
+                return [found[i] for i in probed if i in found][:n]
+
+        reservoir = sampling.Reservoir(n, rng)
+        stmt = operations.find(cls, **filters)
+        result = _crud_stmt_stream(stmt, session=session, batch_size=1000)
+        for partition in result.scalars().partitions():
+            reservoir.extend(partition)
+        rng.shuffle(reservoir.items)
+        return reservoir.items
+
+    @classmethod
+    def to_dicts(
+        cls,
+        rows: t.Iterable[t.Any],
+        *,
+        fields: t.Optional[t.Sequence[str]] = None,
+        exclude: t.Optional[t.Sequence[str]] = None,
+    ) -> t.List[t.Dict[str, t.Any]]:
+        """Convert found items into dicts.
+
+        Rows may be ORM objects, read-only records, projected result rows
+        or mappings, in a list or streamed by iterator.
+
+        Example:
+        ```
+        User.to_dicts(User.find(session, name="Andrew"), exclude=["password"])
+        # [{'id': 1, 'name': 'Andrew'}]
+        ```
+
+        Args:
+            rows (t.Iterable[t.Any]): items
+            fields (t.Sequence[str], optional): fields to include.
+                Defaults to None - all mapped columns.
+            exclude (t.Sequence[str], optional): fields to exclude.
+                Defaults to None.
+
+        Returns:
+            t.List[t.Dict[str, t.Any]]: field name to value for every row
+        """
+        return serialize.serializer(cls, fields=fields, exclude=exclude).to_dicts(rows)
+
+    @classmethod
+    def to_json_bytes(
+        cls,
+        rows: t.Iterable[t.Any],
+        *,
+        fields: t.Optional[t.Sequence[str]] = None,
+        exclude: t.Optional[t.Sequence[str]] = None,
+    ) -> bytes:
+        """Encode found items as JSON array (with orjson, if installed).
+
+        Dates and times are encoded in ISO format, decimals and UUIDs
+        as strings. Accepts the same rows and arguments as `to_dicts`.
+
+        Returns:
+            bytes: UTF-8 JSON
+        """
+        return serialize.serializer(cls, fields=fields, exclude=exclude).to_json_bytes(
+            rows
+        )
+
+    @classmethod
+    @advisable
+    @with_session_sync
+    def find_columns(
+        cls,
+        session: Session,
+        /,
+        *,
+        fields: t.Optional[t.Sequence[str]] = None,
+        rows: t.Optional[int] = None,
+        offset: int = 0,
+        batch_size: int = 10_000,
+        **filters,
+    ) -> t.Dict[str, t.Any]:
+        """Find items and return them as columns instead of ORM objects.
+
+        Numeric columns are returned as `array.array` (or NumPy arrays
+        if NumPy is installed), other columns as lists.
+
+        Example:
+        ```
+        # get ids and names of all users with name Andrew
+        columns = User.find_columns(session, fields=["id", "name"], name="Andrew")
+        columns["id"]  # array('q', [1, 2])
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            fields (t.Sequence[str], optional): columns to return.
+                Defaults to None - all mapped columns.
+            rows(int, optional): Number of rows to return. Defaults to None.
+            offset(int, optional): Number of rows to skip. Defaults to 0.
+            batch_size (int, optional): Number of rows fetched from cursor
+                at once. Defaults to 10_000.
+            **filters: search filters
+
+        Returns:
+            t.Dict[str, t.Any]: column name to column values
+        """
+        columns = columnar.resolve_columns(cls, fields)
+        stmt = operations.find(
+            [column for _, column in columns], offset=offset, rows=rows, **filters
+        )
+        collector = columnar.ColumnCollector(columns)
+        result = _crud_stmt_stream(stmt, session=session, batch_size=batch_size)
+        for partition in result.partitions():
+            collector.extend(partition)
+
+        return collector.finish()
+
+    @classmethod
+    @advisable
+    @with_session_sync
+    @sharding.no_scatter
+    def export(
+        cls,
+        session: Session,
+        /,
+        *,
+        file: t.Union[str, os.PathLike, t.TextIO],
+        format: str = "csv",
+        fields: t.Optional[t.Sequence[str]] = None,
+        batch_size: int = 10_000,
+        progress: t.Optional[t.Callable[[export.ExportProgress], t.Any]] = None,
+        **filters,
+    ) -> int:
+        """Stream found items to CSV or JSON Lines file.
+
+        Rows are read from server-side cursor and written in chunks
+        of `batch_size` rows, so memory usage does not depend on table size.
+
+        Example:
+        ```
+        # export all users with name Andrew
+        User.export(session, file="users.csv", name="Andrew")
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            file (t.Union[str, os.PathLike, t.TextIO]): file path or text file object
+            format (str, optional): "csv" or "jsonl". Defaults to "csv".
+            fields (t.Sequence[str], optional): columns to export.
+                Defaults to None - all mapped columns.
+            batch_size (int, optional): Number of rows fetched and written
+                at once. Defaults to 10_000.
+            progress (t.Callable[[ExportProgress], t.Any], optional): callback
+                called after every written chunk. Defaults to None.
+            **filters: search filters
+
+        Returns:
+            int: number of exported rows
+        """
+        columns = columnar.resolve_columns(cls, fields)
+        writer = export.RowWriter([name for name, _ in columns], format=format)
+        tracker = export.ProgressTracker(progress)
+        stmt = operations.find([column for _, column in columns], **filters)
+
+        with export.open_target(file) as f:
+            f.write(writer.header())
+            result = _crud_stmt_stream(stmt, session=session, batch_size=batch_size)
+            for partition in result.partitions():
+                f.write(writer.encode(partition))
+                tracker.update(len(partition))
+
+        return tracker.rows
+
+    @classmethod
+    @advisable
+    @with_session_sync_iter
+    def changes_since(
+        cls,
+        session: Session,
+        /,
+        *,
+        watermark: t.Any = None,
+        batch: int = 1000,
+        **filters,
+    ) -> t.Iterator[changes.ChangeBatch]:
+        """Iterate over rows changed after watermark.
+
+        Table class should declare `__watermark_column__` - `updated_at`
+        or other monotonically increasing column. Rows are returned
+        in batches ordered by (watermark column, primary key) using keyset
+        pagination, every batch carries watermark to continue from.
+
+        Example:
+        ```
+        for batch in User.changes_since(session, watermark=last_watermark):
+            sync(batch.items)
+            last_watermark = batch.watermark
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            watermark (t.Any, optional): `Watermark` of last seen row
+                or watermark column value. Defaults to None - from the beginning.
+            batch (int, optional): Number of rows per batch. Defaults to 1000.
+            **filters: search filters
+
+        Raises:
+            ValueError: table class has no `__watermark_column__`
+
+        Yields:
+            changes.ChangeBatch: changed rows and next watermark
+        """
+        column = cls.__watermark_column__
+        if column is None:
+            raise ValueError(f"{cls.__name__} has no __watermark_column__")
+
+        pk_col = cls._get_primary_key()
+        watermark = changes.as_watermark(watermark)
+        while True:
+            # rows loaded by previous batches in same session get new values
+            stmt = operations.changes_since_(
+                cls, watermark, rows=batch, **filters
+            ).execution_options(populate_existing=True)
+            items = (_crud_stmt_scalars(stmt, session=session)).all()
+            if not items:
+                return
+
+            last = items[-1]
+            watermark = changes.Watermark(getattr(last, column), getattr(last, pk_col))
+            yield changes.ChangeBatch(items=items, watermark=watermark)
+
+            if len(items) < batch:
+                return
+
+    @classmethod
+    @with_session_sync_iter
+    def deletions_since(
+        cls,
+        session: Session,
+        /,
+        *,
+        watermark: int = 0,
+        batch: int = 1000,
+    ) -> t.Iterator[changes.ChangeBatch]:
+        """Iterate over primary keys of rows deleted after watermark.
+
+        Table class should declare `__tombstones__` table
+        (see `changes.tombstone_table`), rows deleted with `delete`
+        are recorded there.
+
+        Args:
+            session (Session): SQLAlchemy session
+            watermark (int, optional): `Watermark` or tombstone id of last seen
+                deletion. Defaults to 0 - from the beginning.
+            batch (int, optional): Number of deletions per batch.
+                Defaults to 1000.
+
+        Raises:
+            ValueError: table class has no `__tombstones__`
+
+        Yields:
+            changes.ChangeBatch: deleted primary keys (as strings)
+                and next watermark
+        """
+        if cls.__tombstones__ is None:
+            raise ValueError(f"{cls.__name__} has no __tombstones__")
+
+        last_id = changes.as_watermark(watermark).value or 0
+        while True:
+            stmt = operations.deletions_since_(cls, last_id, rows=batch)
+            rows = (_crud_stmt_execute(stmt, session=session)).all()
+            if not rows:
+                return
+
+            last_id = rows[-1].id
+            yield changes.ChangeBatch(
+                items=[row.pk for row in rows], watermark=changes.Watermark(last_id)
+            )
+
+            if len(rows) < batch:
+                return
+
+    @classmethod
+    @advisable
+    @batchable_sync
     @with_session_sync
     def delete(cls, session: Session, /, *, commit: bool = False, **filters) -> bool:
         """Delete items from table
@@ -160,6 +822,10 @@ class DeclarativeCrudBase(DeclarativeBase):
         if not exists:
             return False
 
+        if cls.__tombstones__ is not None:
+            tombstones_stmt = operations.tombstones_(cls, **filters)
+            _crud_stmt_execute(tombstones_stmt, session=session)
+
         delete_stmt = operations.delete_(cls=cls, **filters)
         session.execute(delete_stmt)
         if commit:
@@ -168,6 +834,7 @@ class DeclarativeCrudBase(DeclarativeBase):
         return True
 
     @classmethod
+    @batchable_sync
     @with_session_sync
     def add_many(
         cls: t.Type[_T], session: Session, /, *, items: t.List[_T], commit: bool = False
@@ -190,6 +857,122 @@ class DeclarativeCrudBase(DeclarativeBase):
         if commit:
             session.commit()
 
+    @classmethod
+    @with_session_sync
+    @sharding.no_scatter
+    def ingest(
+        cls,
+        session: Session,
+        /,
+        *,
+        source: t.Union[str, os.PathLike, t.Iterable[t.Any]],
+        batch_size: int = 1000,
+        mapping: t.Optional[t.Mapping[str, str]] = None,
+        format: t.Optional[str] = None,
+        on_error: str = "raise",
+        max_pending: int = 2,
+        commit: bool = False,
+    ) -> ingest.IngestResult:
+        """Insert rows from iterator or CSV / JSON Lines file.
+
+        Records are converted to row dicts and inserted in bulk without
+        creating ORM objects. Source is read in background thread while
+        current batch is inserted, at most `max_pending` batches are buffered.
+
+        Example:
+        ```
+        # load users from file, skipping bad rows
+        User.ingest(session, source="users.csv", on_error="skip", commit=True)
+
+        # load users from iterator of dicts
+        User.ingest(session, source=({"name": n} for n in names))
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            source (t.Union[str, os.PathLike, t.Iterable[t.Any]]): file path
+                or iterable of mappings
+            batch_size (int, optional): rows per insert statement.
+                Defaults to 1000.
+            mapping (t.Mapping[str, str], optional): source key to column name.
+                Defaults to None.
+            format (str, optional): file format, "csv" or "jsonl".
+                Defaults to None - guess by file extension.
+            on_error (str, optional): "raise" - stop on first error,
+                "skip" - skip bad rows, "reject_batch" - skip whole batch
+                containing bad row. Defaults to "raise".
+            max_pending (int, optional): number of batches read ahead.
+                Defaults to 2.
+            commit (bool, optional): Commit or not. Defaults to False.
+
+        Returns:
+            ingest.IngestResult: number of inserted, skipped and rejected rows
+        """
+        if on_error not in ingest.ON_ERROR:
+            raise ValueError(f"on_error should be one of {ingest.ON_ERROR}")
+
+        records = ingest.records(source, format=format)
+        if hasattr(records, "__anext__"):
+            raise TypeError("Async iterator source requires async session")
+
+        converter = ingest.RowConverter(cls, mapping=mapping)
+        batches = ingest.iter_batches(records, converter, batch_size, on_error)
+
+        inserted = skipped = rejected = 0
+        for batch in ingest.pipeline(batches, max_pending=max_pending):
+            if batch.bad and on_error == "reject_batch":
+                rejected += len(batch.rows) + batch.bad
+                continue
+
+            ok, failed = cls._ingest_rows(session, batch.rows, on_error=on_error)
+            inserted += ok
+            skipped += batch.bad
+            if on_error == "skip":
+                skipped += failed
+            else:
+                rejected += failed
+
+        if commit:
+            session.commit()
+
+        return ingest.IngestResult(
+            inserted=inserted, skipped=skipped, rejected=rejected
+        )
+
+    @classmethod
+    def _ingest_rows(
+        cls, session: Session, rows: t.List[t.Dict[str, t.Any]], on_error: str
+    ) -> t.Tuple[int, int]:
+        """Insert rows, return number of inserted and failed rows"""
+        if not rows:
+            return 0, 0
+
+        stmt = operations.insert_(cls)
+        if on_error == "raise":
+            session.execute(stmt, rows)
+            return len(rows), 0
+
+        try:
+            with session.begin_nested():
+                session.execute(stmt, rows)
+            return len(rows), 0
+        except DBAPIError:
+            if on_error == "reject_batch":
+                return 0, len(rows)
+
+        # find bad rows one by one
+        inserted = 0
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    session.execute(stmt, [row])
+                inserted += 1
+            except DBAPIError:
+                continue
+
+        return inserted, len(rows) - inserted
+
+    @batchable_sync
     @with_session_sync
     def add(self: _T, session: Session, /, *, commit: bool = False) -> _T:
         """Add one item to table.
@@ -211,9 +994,17 @@ class DeclarativeCrudBase(DeclarativeBase):
         return self
 
     @classmethod
+    @advisable
+    @batchable_sync
     @with_session_sync
     def update(
-        cls: t.Type[_T], session: Session, /, *, values: dict, **filters
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        values: dict,
+        expected_version: t.Optional[t.Any] = None,
+        **filters,
     ) -> t.Type[_T]:
         """Update table items values
 
@@ -226,11 +1017,178 @@ class DeclarativeCrudBase(DeclarativeBase):
         Args:
             session (Session): SQLAlchemy session
             values (dict): values to update
+            expected_version (t.Any, optional): update rows only if their
+                `__version_column__` equals this value. Defaults to None.
             **filters: search filters
 
+        Raises:
+            ValueError: `expected_version` passed, but table class
+                has no `__version_column__`
+            VersionConflictError: no rows with expected version found
+
         Returns:
             t.Type[_T]: updated item
 
         """
-        stmt = operations.update_(cls, values=values, **filters)
-        return _crud_stmt_execute(stmt=stmt, session=session)
+        stmt = operations.update_(
+            cls, values=values, expected_version=expected_version, **filters
+        )
+        result = _crud_stmt_execute(stmt=stmt, session=session)
+        if expected_version is not None and result.rowcount == 0:
+            raise VersionConflictError(
+                f"No {cls.__name__} rows with {filters} "
+                f"and {cls.__version_column__}={expected_version}"
+            )
+        return result
+
+    @classmethod
+    @with_session_sync
+    def update_many(
+        cls,
+        session: Session,
+        /,
+        *,
+        items: t.Sequence[t.Mapping[str, t.Any]],
+        commit: bool = False,
+    ) -> int:
+        """Update many rows by primary key with different values.
+
+        Items with same set of fields are updated with one executemany
+        statement. If table class declares `__version_column__`, every item
+        should contain version it was read with, version is checked
+        and incremented.
+
+        Example:
+        ```
+        # rename users 1 and 2
+        User.update_many(
+            session, items=[{"id": 1, "name": "Bob"}, {"id": 2, "name": "John"}]
+        )
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            items (t.Sequence[t.Mapping[str, t.Any]]): primary key
+                and new values of rows
+            commit (bool, optional): Commit or not. Defaults to False.
+
+        Raises:
+            ValueError: item has no primary key or version, has no values
+                to update or has fields that are not mapped columns
+            VersionConflictError: some rows were changed since read, transaction
+                should be rolled back
+
+        Returns:
+            int: number of updated rows
+        """
+        pk_col = cls._get_primary_key()
+        version = cls.__version_column__
+        column_attrs = inspect(cls).column_attrs
+
+        groups: t.Dict[t.Tuple[str, ...], t.List[dict]] = {}
+        for item in items:
+            if pk_col not in item or (version is not None and version not in item):
+                raise ValueError(f"Item should contain {pk_col} and version: {item}")
+
+            fields = tuple(sorted(k for k in item if k not in (pk_col, version)))
+            unknown = [k for k in fields if k not in column_attrs]
+            if unknown:
+                raise ValueError(f"{cls.__name__} has no mapped columns {unknown}")
+            if not fields and version is None:
+                raise ValueError(f"Item has no values to update: {item}")
+            params = {f"_v_{k}": item[k] for k in fields}
+            params["_pk"] = item[pk_col]
+            if version is not None:
+                params["_expected"] = item[version]
+            groups.setdefault(fields, []).append(params)
+
+        dialect = session.get_bind().dialect
+        updated = 0
+        for fields, params in groups.items():
+            stmt = operations.update_many_(cls, fields)
+            if dialect.supports_sane_multi_rowcount:
+                updated += (_crud_stmt_execute_many(stmt, params, session)).rowcount
+                continue
+            for row_params in params:
+                updated += (_crud_stmt_execute_many(stmt, row_params, session)).rowcount
+
+        if version is not None and updated < len(items):
+            raise VersionConflictError(
+                f"{len(items) - updated} of {len(items)} {cls.__name__} rows "
+                "were changed or deleted"
+            )
+
+        if commit:
+            session.commit()
+
+        return updated
+
+    @classmethod
+    @with_session_sync
+    def update_with_retry(
+        cls: t.Type[_T],
+        session: Session,
+        /,
+        *,
+        pk: t.Any,
+        change: t.Callable[[_T], dict],
+        retries: int = 3,
+        commit: bool = False,
+    ) -> t.Optional[_T]:
+        """Read-modify-write row with optimistic concurrency control.
+
+        Row is read, `change` computes new values from it and row is updated
+        only if its version was not changed meanwhile. On conflict row
+        is read again and `change` is called again.
+
+        Example:
+        ```
+        # increment user balance without row locks
+        Account.update_with_retry(
+            session, pk=1, change=lambda a: {"balance": a.balance + 10}
+        )
+        ```
+
+        Args:
+            session (Session): SQLAlchemy session
+            pk (t.Any): primary key value
+            change (t.Callable[[_T], dict]): returns values to update
+            retries (int, optional): number of retries. Defaults to 3.
+            commit (bool, optional): Commit or not. Defaults to False.
+
+        Raises:
+            ValueError: table class has no `__version_column__`
+            VersionConflictError: row was changed on every attempt
+
+        Returns:
+            t.Optional[_T]: updated item. None if row does not exist
+        """
+        version = cls.__version_column__
+        if version is None:
+            raise ValueError(f"{cls.__name__} has no __version_column__")
+
+        pk_col = cls._get_primary_key()
+        stmt = operations.find(cls, **{pk_col: pk}).execution_options(
+            populate_existing=True
+        )
+        for attempt in range(retries + 1):
+            item = (_crud_stmt_scalars(stmt, session=session)).one_or_none()
+            if item is None:
+                return None
+
+            expected_version = getattr(item, version)
+            try:
+                cls.update(
+                    session,
+                    values=change(item),
+                    expected_version=expected_version,
+                    **{pk_col: pk},
+                )
+            except VersionConflictError:
+                if attempt == retries:
+                    raise
+                continue
+
+            if commit:
+                session.commit()
+            return item
@@ -0,0 +1,64 @@
+import typing as t
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, func
+
+
+class Watermark(t.NamedTuple):
+    """Position in change feed: last seen watermark column value and PK"""
+
+    value: t.Any
+    pk: t.Any = None
+
+
+class ChangeBatch(t.NamedTuple):
+    """Batch of changed rows and watermark to continue from"""
+
+    items: t.Sequence[t.Any]
+    watermark: Watermark
+
+
+def as_watermark(watermark: t.Any) -> Watermark:
+    """Convert raw watermark column value to `Watermark`"""
+    if isinstance(watermark, Watermark):
+        return watermark
+    return Watermark(value=watermark)
+
+
+def tombstone_table(metadata: MetaData, name: str = "crudal_tombstone") -> Table:
+    """Return (define once) table of deleted rows.
+
+    Set it as `__tombstones__` of table class to record primary keys
+    of rows deleted with crudal `delete`.
+
+    Example:
+    ```
+    class User(DeclarativeCrudBase):
+        __tablename__ = "person"
+        __watermark_column__ = "updated_at"
+        __tombstones__ = tombstone_table(DeclarativeCrudBase.metadata)
+    ```
+
+    Args:
+        metadata (MetaData): metadata of table classes
+        name (str, optional): table name. Defaults to "crudal_tombstone".
+
+    Returns:
+        Table: tombstone table
+    """
+    if name in metadata.tables:
+        return metadata.tables[name]
+
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("table_name", String(255), nullable=False),
+        Column("pk", String(255), nullable=False),
+        Column(
+            "deleted_at",
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+        Index(f"ix_{name}_table_name_id", "table_name", "id"),
+    )
@@ -0,0 +1,108 @@
+import array
+import typing as t
+
+from sqlalchemy.inspection import inspect
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# array.array typecodes for numeric column types
+_TYPECODES = {int: "q", float: "d"}
+
+
+def resolve_columns(
+    cls, fields: t.Optional[t.Sequence[str]] = None
+) -> t.List[t.Tuple[str, t.Any]]:
+    """Resolve field names to mapped column attributes.
+
+    Args:
+        cls: table class
+        fields (t.Optional[t.Sequence[str]], optional): field names.
+            Defaults to None - all mapped columns.
+
+    Raises:
+        ValueError: field is not a mapped column
+
+    Returns:
+        t.List[t.Tuple[str, t.Any]]: pairs of field name and column attribute
+    """
+    column_attrs = inspect(cls).column_attrs
+    if fields is None:
+        fields = [attr.key for attr in column_attrs]
+
+    columns = []
+    for field in fields:
+        if field not in column_attrs:
+            raise ValueError(f"{cls.__name__} has no mapped column {field!r}")
+        columns.append((field, getattr(cls, field)))
+
+    return columns
+
+
+def _typecode(column) -> t.Optional[str]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+
+    return _TYPECODES.get(python_type)
+
+
+class ColumnCollector:
+    """Accumulate result rows into per-column arrays.
+
+    Numeric columns are stored in `array.array`, other columns in lists.
+    If a numeric column turns out to contain NULLs it falls back to a list.
+    """
+
+    def __init__(self, columns: t.Sequence[t.Tuple[str, t.Any]]):
+        self.names = [name for name, _ in columns]
+        self._data: t.Dict[str, t.Any] = {}
+        for name, column in columns:
+            typecode = _typecode(column)
+            self._data[name] = array.array(typecode) if typecode else []
+
+    def extend(self, rows: t.Sequence[t.Sequence[t.Any]]) -> None:
+        """Append a batch of rows.
+
+        Args:
+            rows (t.Sequence[t.Sequence[t.Any]]): result rows
+        """
+        if not rows:
+            return
+
+        for name, values in zip(self.names, zip(*rows)):
+            target = self._data[name]
+            size = len(target)
+            try:
+                target.extend(values)
+            except (TypeError, OverflowError):
+                # NULL in numeric column or value out of array item range,
+                # keep values as python objects
+                del target[size:]
+                self._data[name] = target.tolist() + list(values)
+
+    def finish(self) -> t.Dict[str, t.Any]:
+        """Return collected columns.
+
+        Numeric arrays are wrapped into NumPy arrays (without copying)
+        when NumPy is installed.
+
+        Returns:
+            t.Dict[str, t.Any]: column name to column values
+        """
+        if numpy is None:
+            return self._data
+
+        columns = {}
+        for name, values in self._data.items():
+            if isinstance(values, array.array):
+                if len(values):
+                    values = numpy.frombuffer(values, dtype=values.typecode)
+                else:
+                    values = numpy.empty(0, dtype=values.typecode)
+            columns[name] = values
+
+        return columns
@@ -0,0 +1,210 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import sys
+import threading
+import typing as t
+from collections import Counter
+from contextvars import ContextVar
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+import crudal
+from crudal.exceptions import QueryPatternError
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover
+    greenlet = None
+
+# frames of these packages are skipped when looking for call site
+_SKIP_PATHS = tuple(
+    os.path.dirname(module.__file__) + os.sep
+    for module in (sqlalchemy, crudal, asyncio, concurrent.futures)
+)
+_SKIP_FILES = {contextlib.__file__, threading.__file__}
+
+_MAX_CALL_SITES = 5
+
+# detectors active in current thread / task
+_detectors: ContextVar[t.Tuple["QueryDetector", ...]] = ContextVar(
+    "crudal_query_detectors", default=()
+)
+# number of active detectors in all contexts, listener is removed at zero
+_listeners = 0
+_lock = threading.Lock()
+
+
+class Finding(t.NamedTuple):
+    """Group of repeated statements.
+
+    `kind` is "repeated" for statements of same shape with different
+    parameters (N+1) and "identical" for same statement with same parameters.
+    """
+
+    kind: str
+    sql: str
+    count: int
+    call_sites: t.Tuple[str, ...]
+
+
+def _frames() -> t.Iterator[t.Any]:
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+    # async sessions run sync code in child greenlet,
+    # continue with stack of awaiting coroutine
+    parent = greenlet.getcurrent().parent if greenlet is not None else None
+    while parent is not None:
+        frame = parent.gr_frame
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        parent = parent.parent
+
+
+def _call_site() -> str:
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if not filename.startswith(_SKIP_PATHS) and filename not in _SKIP_FILES:
+            return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return "<unknown>"
+
+
+def _is_crudal(state: ORMExecuteState) -> bool:
+    bases = (crudal.DeclarativeCrudBase, crudal.DeclarativeCrudBaseAsync)
+    if any(issubclass(mapper.class_, bases) for mapper in state.all_mappers):
+        return True
+
+    statement = state.statement
+    tables = [getattr(statement, "table", None)]
+    if hasattr(statement, "get_final_froms"):
+        tables.extend(statement.get_final_froms())
+    metadatas = {base.metadata for base in bases}
+    return any(getattr(table, "metadata", None) in metadatas for table in tables)
+
+
+def _on_execute(state: ORMExecuteState) -> None:
+    detectors = _detectors.get()
+    if not detectors or not _is_crudal(state):
+        return
+
+    cache_key = state.statement._generate_cache_key()
+    if cache_key is None:
+        shape, params = str(state.statement), repr(state.parameters)
+    else:
+        shape = cache_key.key
+        params = repr(
+            ([bind.effective_value for bind in cache_key.bindparams], state.parameters)
+        )
+
+    call_site = _call_site()
+    for detector in detectors:
+        detector.record(shape, params, state.statement, call_site)
+
+
+class QueryDetector:
+    """Detect repeated queries of crudal models.
+
+    Statements executed in crudal model sessions inside `with` block
+    are grouped by shape (statement without parameter values). Shapes
+    executed at least `threshold` times are reported with their call sites,
+    as well as statements executed several times with identical parameters.
+
+    Only statements of current thread or task are recorded (and of tasks
+    created inside the block), concurrent requests are not counted.
+
+    Example:
+    ```
+    with QueryDetector(raise_above=10) as detector:
+        for order in Order.all():
+            Customer.find_by_pk(pk=order.customer_id)
+
+    print(detector.format_report())
+    ```
+
+    Args:
+        threshold (int, optional): number of executions of one shape
+            to report. Defaults to 2.
+        raise_above (t.Optional[int], optional): raise `QueryPatternError`
+            at block exit if some shape was executed more times.
+            Defaults to None - do not raise.
+    """
+
+    def __init__(self, threshold: int = 2, raise_above: t.Optional[int] = None):
+        self.threshold = threshold
+        self.raise_above = raise_above
+        self.shapes: t.Counter[t.Any] = Counter()
+        self.identical: t.Counter[t.Tuple[t.Any, str]] = Counter()
+        self._sql: t.Dict[t.Any, str] = {}
+        self._call_sites: t.Dict[t.Any, t.List[str]] = {}
+
+    def record(self, shape: t.Any, params: str, statement: t.Any, call_site: str):
+        """Count statement execution"""
+        self.shapes[shape] += 1
+        self.identical[(shape, params)] += 1
+        if shape not in self._sql:
+            try:
+                self._sql[shape] = str(statement)
+            except Exception:
+                self._sql[shape] = repr(statement)
+            self._call_sites[shape] = []
+
+        call_sites = self._call_sites[shape]
+        if call_site not in call_sites and len(call_sites) < _MAX_CALL_SITES:
+            call_sites.append(call_site)
+
+    def report(self) -> t.List[Finding]:
+        """Return repeated statements, most frequent first"""
+        findings = [
+            Finding("repeated", self._sql[shape], count, tuple(self._call_sites[shape]))
+            for shape, count in self.shapes.most_common()
+            if count >= self.threshold
+        ]
+        findings.extend(
+            Finding(
+                "identical", self._sql[shape], count, tuple(self._call_sites[shape])
+            )
+            for (shape, _), count in self.identical.most_common()
+            if count > 1
+        )
+        return findings
+
+    def format_report(self) -> str:
+        """Return human readable report"""
+        lines = []
+        for finding in self.report():
+            lines.append(f"{finding.kind} x{finding.count}: {finding.sql}")
+            lines.extend(f"    at {call_site}" for call_site in finding.call_sites)
+        return "\n".join(lines)
+
+    def __enter__(self) -> "QueryDetector":
+        global _listeners
+        with _lock:
+            if not _listeners:
+                event.listen(Session, "do_orm_execute", _on_execute)
+            _listeners += 1
+        self._token = _detectors.set(_detectors.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        global _listeners
+        _detectors.reset(self._token)
+        with _lock:
+            _listeners -= 1
+            if not _listeners:
+                event.remove(Session, "do_orm_execute", _on_execute)
+
+        if exc_type is not None or self.raise_above is None:
+            return
+
+        if any(count > self.raise_above for count in self.shapes.values()):
+            raise QueryPatternError(
+                f"Statements executed more than {self.raise_above} times:\n"
+                + self.format_report()
+            )
@@ -0,0 +1,14 @@
+class CrudalError(Exception):
+    """Base class of crudal errors"""
+
+
+class VersionConflictError(CrudalError):
+    """Row was changed or deleted since its version was read"""
+
+
+class QueryPatternError(CrudalError):
+    """Repeated queries (N+1) found by query detector"""
+
+
+class StatementTimeoutError(CrudalError, TimeoutError):
+    """Operation did not complete within its timeout"""
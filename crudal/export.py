@@ -0,0 +1,130 @@
+import asyncio
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import time
+import typing as t
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+class ExportProgress(t.NamedTuple):
+    """Export progress reported after every written chunk"""
+
+    rows: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProgressTracker:
+    """Count written rows and report progress to callback."""
+
+    def __init__(self, callback: t.Optional[t.Callable[[ExportProgress], t.Any]]):
+        self.callback = callback
+        self.rows = 0
+        self._started = time.monotonic()
+
+    def update(self, rows: int) -> None:
+        self.rows += rows
+        if self.callback is not None:
+            elapsed = time.monotonic() - self._started
+            self.callback(ExportProgress(rows=self.rows, elapsed=elapsed))
+
+
+def json_default(value: t.Any) -> t.Any:
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RowWriter:
+    """Encode result rows into text chunks of export format.
+
+    Args:
+        fields (t.Sequence[str]): names of exported fields
+        format (str): one of `EXPORT_FORMATS`
+    """
+
+    def __init__(self, fields: t.Sequence[str], format: str):
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format {format!r}, expected one of {EXPORT_FORMATS}"
+            )
+
+        self.fields = list(fields)
+        self.format = format
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer) if format == "csv" else None
+
+    def _flush(self) -> str:
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return chunk
+
+    def header(self) -> str:
+        """Return file header (CSV column names)"""
+        if self._csv is not None:
+            self._csv.writerow(self.fields)
+        return self._flush()
+
+    def encode(self, rows: t.Iterable[t.Sequence[t.Any]]) -> str:
+        """Encode batch of rows into one text chunk"""
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            for row in rows:
+                self._buffer.write(
+                    json.dumps(dict(zip(self.fields, row)), default=json_default)
+                )
+                self._buffer.write("\n")
+        return self._flush()
+
+
+@contextmanager
+def open_target(file: t.Union[str, os.PathLike, t.TextIO]) -> t.Iterator[t.TextIO]:
+    """Open export target.
+
+    Paths are opened (and closed) here, file objects are used as is.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w", newline="", encoding="utf-8") as f:
+            yield f
+    else:
+        yield file
+
+
+@asynccontextmanager
+async def open_target_async(
+    file: t.Union[str, os.PathLike, t.TextIO]
+) -> t.AsyncIterator[t.TextIO]:
+    """Async version of `open_target`.
+
+    Paths are opened and closed in default executor,
+    so they do not block event loop.
+    """
+    if not isinstance(file, (str, os.PathLike)):
+        yield file
+        return
+
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(
+        None, partial(open, file, "w", newline="", encoding="utf-8")
+    )
+    try:
+        yield f
+    finally:
+        await loop.run_in_executor(None, f.close)
@@ -0,0 +1,287 @@
+import asyncio
+import csv
+import datetime
+import decimal
+import json
+import os
+import queue
+import threading
+import typing as t
+
+from sqlalchemy.inspection import inspect
+
+INGEST_FORMATS = ("csv", "jsonl")
+ON_ERROR = ("raise", "skip", "reject_batch")
+
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+
+
+class IngestResult(t.NamedTuple):
+    """Ingestion summary"""
+
+    inserted: int
+    skipped: int
+    rejected: int
+
+
+class Batch(t.NamedTuple):
+    """Converted rows and number of records that failed conversion"""
+
+    rows: t.List[t.Dict[str, t.Any]]
+    bad: int
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"Invalid boolean value {value!r}")
+
+
+_PARSERS: t.Dict[type, t.Callable[[str], t.Any]] = {
+    int: int,
+    float: float,
+    bool: _to_bool,
+    decimal.Decimal: decimal.Decimal,
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+}
+
+
+def _parser(column) -> t.Optional[t.Callable[[str], t.Any]]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+
+    return _PARSERS.get(python_type)
+
+
+class RowConverter:
+    """Convert source records into row dicts of table class.
+
+    Records are mappings (or JSON encoded strings of them). Keys are renamed
+    with `mapping`, keys that are not mapped columns are dropped. String values
+    of non string columns (as read from CSV) are parsed into column type.
+
+    Args:
+        cls: table class
+        mapping (t.Optional[t.Mapping[str, str]], optional): source key
+            to column name. Defaults to None.
+    """
+
+    def __init__(self, cls, mapping: t.Optional[t.Mapping[str, str]] = None):
+        self.mapping = dict(mapping or {})
+        self._parsers = {
+            attr.key: _parser(attr.columns[0]) for attr in inspect(cls).column_attrs
+        }
+
+    def __call__(self, record: t.Union[str, t.Mapping[str, t.Any]]) -> t.Dict:
+        if isinstance(record, str):
+            record = json.loads(record)
+        if not isinstance(record, t.Mapping):
+            raise ValueError(f"Expected mapping record, got {type(record).__name__}")
+
+        row = {}
+        for key, value in record.items():
+            key = self.mapping.get(key, key)
+            if key not in self._parsers:
+                continue
+
+            parser = self._parsers[key]
+            if parser is not None and isinstance(value, str):
+                value = parser(value) if value != "" else None
+            row[key] = value
+
+        return row
+
+
+def _file_format(path: t.Union[str, os.PathLike], format: t.Optional[str]) -> str:
+    if format is None:
+        format = os.path.splitext(os.fspath(path))[1].lstrip(".").lower()
+        format = "jsonl" if format in ("json", "ndjson") else format
+    if format not in INGEST_FORMATS:
+        raise ValueError(
+            f"Unknown ingest format {format!r}, expected one of {INGEST_FORMATS}"
+        )
+    return format
+
+
+def read_file(
+    path: t.Union[str, os.PathLike], format: t.Optional[str] = None
+) -> t.Iterator[t.Union[str, t.Dict[str, str]]]:
+    """Lazily read records from CSV or JSON Lines file.
+
+    JSON lines are yielded undecoded, `RowConverter` decodes them so that
+    malformed lines are handled as any other bad record.
+
+    Args:
+        path (t.Union[str, os.PathLike]): file path
+        format (t.Optional[str], optional): "csv" or "jsonl".
+            Defaults to None - guess by file extension.
+    """
+    format = _file_format(path, format)
+    with open(path, newline="", encoding="utf-8") as f:
+        if format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def records(
+    source: t.Any, format: t.Optional[str] = None
+) -> t.Union[t.Iterator[t.Any], t.AsyncIterator[t.Any]]:
+    """Return records iterator of ingestion source"""
+    if isinstance(source, (str, os.PathLike)):
+        return read_file(source, format=format)
+    if hasattr(source, "__aiter__"):
+        return source.__aiter__()
+    return iter(source)
+
+
+def _convert(
+    records: t.Iterable[t.Any], converter: RowConverter, on_error: str
+) -> Batch:
+    rows, bad = [], 0
+    for record in records:
+        try:
+            rows.append(converter(record))
+        except (ValueError, TypeError, ArithmeticError):
+            if on_error == "raise":
+                raise
+            bad += 1
+
+    return Batch(rows=rows, bad=bad)
+
+
+def _take(iterator: t.Iterator[t.Any], size: int) -> t.List[t.Any]:
+    chunk = []
+    for record in iterator:
+        chunk.append(record)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+def iter_batches(
+    iterator: t.Iterator[t.Any], converter: RowConverter, size: int, on_error: str
+) -> t.Iterator[Batch]:
+    """Split records into converted batches"""
+    while True:
+        chunk = _take(iterator, size)
+        if not chunk:
+            return
+        yield _convert(chunk, converter, on_error)
+
+
+_DONE = object()
+
+
+class _Failure(t.NamedTuple):
+    exc: BaseException
+
+
+def pipeline(batches: t.Iterator[Batch], max_pending: int) -> t.Iterator[Batch]:
+    """Produce batches in background thread.
+
+    Reading and converting the next batches overlaps with inserting the current
+    one. At most `max_pending` batches are buffered, the producer waits
+    for the consumer when the buffer is full.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+async def _atake(iterator: t.AsyncIterator[t.Any], size: int) -> t.List[t.Any]:
+    chunk = []
+    async for record in iterator:
+        chunk.append(record)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+async def apipeline(
+    iterator: t.Union[t.Iterator[t.Any], t.AsyncIterator[t.Any]],
+    converter: RowConverter,
+    size: int,
+    on_error: str,
+    max_pending: int,
+) -> t.AsyncIterator[Batch]:
+    """Produce converted batches in background task.
+
+    Async version of `pipeline`. Sync sources (files, iterators) are read
+    in default executor so they do not block event loop.
+    """
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+    loop = asyncio.get_running_loop()
+
+    async def next_chunk() -> t.List[t.Any]:
+        if hasattr(iterator, "__anext__"):
+            return await _atake(iterator, size)
+        return await loop.run_in_executor(None, _take, iterator, size)
+
+    async def produce():
+        try:
+            while True:
+                chunk = await next_chunk()
+                if not chunk:
+                    break
+                await buffer.put(_convert(chunk, converter, on_error))
+            await buffer.put(_DONE)
+        except Exception as e:
+            await buffer.put(_Failure(e))
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
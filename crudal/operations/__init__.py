@@ -1,3 +1,9 @@
-from .delete import delete_
-from .find import find
-from .update import update_
+from .add import insert_
+from .changes import changes_since_, deletions_since_, tombstones_
+from .delete import delete_, delete_bulk_, delete_in_
+from .explain import explain_, plan_lines
+from .find import exists_many_, find
+from .order import OrderBy, OrderKey, order_by_, parse_order
+from .sample import pk_range_, row_estimate_, sample_probe_, tablesample_
+from .search import search_, search_index_, search_rebuild_
+from .update import update_, update_bulk_, update_in_, update_many_
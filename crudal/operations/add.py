@@ -0,0 +1,14 @@
+from sqlalchemy import Insert, insert
+
+
+def insert_(cls) -> Insert:
+    """Generate insert statement.
+
+    Executed with list of row dicts it becomes bulk (executemany) insert
+    that does not create ORM objects.
+
+    Returns:
+        Insert: insert statement
+    """
+    stmt = insert(cls)
+    return stmt
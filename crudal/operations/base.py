@@ -16,8 +16,7 @@ def _select_stmt_fields(
     Returns:
         Select: select statement
     """
-    # generate docstring
-    if isinstance(t, tuple) or isinstance(t, list):
+    if isinstance(fields, (tuple, list)):
         stmt = select(*fields)
     else:
         stmt = select(fields)
@@ -0,0 +1,90 @@
+import typing as t
+
+from sqlalchemy import (
+    Insert,
+    Select,
+    String,
+    Table,
+    and_,
+    cast,
+    insert,
+    literal,
+    or_,
+    select,
+)
+
+from crudal.changes import Watermark
+
+from .find import find
+
+
+def changes_since_(
+    cls, watermark: Watermark, rows: t.Optional[int] = None, **filters
+) -> Select:
+    """Generate select of rows changed after watermark.
+
+    Rows are ordered by (`__watermark_column__`, primary key), so the
+    last row of result is the next watermark.
+
+    Args:
+        watermark (Watermark): last seen position. `pk` may be None,
+            then rows with greater watermark column value are selected
+        rows (t.Optional[int], optional): number of rows to return.
+            Defaults to None.
+        **filters: search filters
+
+    Returns:
+        Select: select statement
+    """
+    column = getattr(cls, cls.__watermark_column__)
+    pk_column = getattr(cls, cls._get_primary_key())
+
+    stmt = find(cls, rows=rows, **filters)
+    if watermark.value is not None:
+        if watermark.pk is None:
+            stmt = stmt.where(column > watermark.value)
+        else:
+            stmt = stmt.where(
+                or_(
+                    column > watermark.value,
+                    and_(column == watermark.value, pk_column > watermark.pk),
+                )
+            )
+
+    return stmt.order_by(column, pk_column)
+
+
+def tombstones_(cls, **filters) -> Insert:
+    """Generate insert of tombstones for rows matching filters.
+
+    Returns:
+        Insert: INSERT ... SELECT statement
+    """
+    pk_column = getattr(cls, cls._get_primary_key())
+    rows = (
+        select(literal(cls.__tablename__), cast(pk_column, String))
+        .select_from(cls)
+        .filter_by(**filters)
+    )
+    return insert(cls.__tombstones__).from_select(["table_name", "pk"], rows)
+
+
+def deletions_since_(cls, last_id: int, rows: t.Optional[int] = None) -> Select:
+    """Generate select of tombstones recorded after `last_id`.
+
+    Returns:
+        Select: select of tombstone id and deleted row primary key
+    """
+    tombstones: Table = cls.__tombstones__
+    stmt = (
+        select(tombstones.c.id, tombstones.c.pk)
+        .where(
+            tombstones.c.table_name == cls.__tablename__,
+            tombstones.c.id > last_id,
+        )
+        .order_by(tombstones.c.id)
+    )
+    if rows is not None:
+        stmt = stmt.limit(rows)
+
+    return stmt
@@ -1,4 +1,7 @@
-from sqlalchemy import Delete, delete
+import typing as t
+
+from sqlalchemy import Delete, bindparam, delete
+from sqlalchemy.inspection import inspect
 
 
 def delete_(cls, **kwargs) -> Delete:
@@ -9,3 +12,31 @@ def delete_(cls, **kwargs) -> Delete:
     """
     stmt = delete(cls).filter_by(**kwargs)
     return stmt
+
+
+def delete_in_(cls, field: str, values: t.Sequence[t.Any]) -> Delete:
+    """Generate delete statement of rows with field value in values
+
+    Returns:
+        Delete: delete statement
+    """
+    stmt = delete(cls).where(getattr(cls, field).in_(values))
+    return stmt
+
+
+def delete_bulk_(cls, filter_fields: t.Sequence[str]) -> Delete:
+    """Generate delete statement for executemany.
+
+    Parameters are `_f_<field>` for every filter field.
+
+    Returns:
+        Delete: delete statement
+    """
+    column_attrs = inspect(cls).column_attrs
+    stmt = delete(cls.__table__).where(
+        *(
+            column_attrs[field].columns[0] == bindparam(f"_f_{field}")
+            for field in filter_fields
+        )
+    )
+    return stmt
@@ -0,0 +1,66 @@
+import typing as t
+
+from sqlalchemy.engine import Dialect
+
+from .delete import delete_
+from .find import find
+from .update import update_
+
+EXPLAIN_OPERATIONS = ("find", "exists", "update", "delete")
+
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+
+
+def explain_(
+    cls, dialect: Dialect, op: str = "find", values: t.Optional[dict] = None, **filters
+) -> t.Tuple[str, t.Union[dict, tuple]]:
+    """Generate EXPLAIN statement for crudal operation.
+
+    Args:
+        cls: table class
+        dialect (Dialect): database dialect
+        op (str, optional): one of `EXPLAIN_OPERATIONS`. Defaults to "find".
+        values (t.Optional[dict], optional): update values. Defaults to None.
+        **filters: search filters
+
+    Raises:
+        ValueError: unknown operation
+        NotImplementedError: dialect has no known EXPLAIN syntax
+
+    Returns:
+        t.Tuple[str, t.Union[dict, tuple]]: SQL string and its parameters
+            in dialect paramstyle
+    """
+    if op in ("find", "exists"):
+        stmt = find(cls, **filters)
+    elif op == "update":
+        stmt = update_(cls, values=values or {}, **filters)
+    elif op == "delete":
+        stmt = delete_(cls, **filters)
+    else:
+        raise ValueError(
+            f"Unknown operation {op!r}, expected one of {EXPLAIN_OPERATIONS}"
+        )
+
+    if dialect.name not in _EXPLAIN_PREFIX:
+        raise NotImplementedError(f"EXPLAIN is not supported for {dialect.name}")
+
+    compiled = stmt.compile(dialect=dialect)
+    params = compiled.params
+    if compiled.positiontup is not None:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    return _EXPLAIN_PREFIX[dialect.name] + str(compiled), params
+
+
+def plan_lines(dialect: Dialect, rows: t.Iterable[t.Sequence[t.Any]]) -> t.List[str]:
+    """Convert EXPLAIN result rows to plan lines"""
+    if dialect.name == "sqlite":
+        # id, parent, notused, detail
+        return [row[-1] for row in rows]
+    return [" ".join(str(value) for value in row) for row in rows]
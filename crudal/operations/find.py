@@ -1,8 +1,11 @@
 import typing as t
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, select, tuple_
+
+from crudal.columnar import resolve_columns
 
 from .base import _select_stmt_fields
+from .order import OrderBy, order_by_
 
 _T = t.TypeVar("_T")
 
@@ -11,6 +14,7 @@ def find(
     cls: t.Union[t.Any, t.Tuple],
     offset: t.Optional[int] = None,
     rows: t.Optional[int] = None,
+    order_by: t.Optional[OrderBy] = None,
     **kwargs
 ) -> Select:
     """Generate select statement with filters.
@@ -19,6 +23,8 @@ def find(
         cls (t.Union[t.Any, t.Tuple]): table class
         offset (t.Optional[int], optional): number of rows to skip. Defaults to None.
         rows (t.Optional[int], optional): number of rows to return. Defaults to None.
+        order_by (t.Optional[OrderBy], optional): ordering, like
+            `["-created_at nulls last", "name"]`. Defaults to None.
         **kwargs: search filters
 
     Returns:
@@ -26,6 +32,10 @@ def find(
     """
     select_stmt = _select_stmt_fields(fields=cls, offset=offset, rows=rows)
     stmt = select_stmt.filter_by(**kwargs)
+    if order_by:
+        # columns of one table class (read-only records)
+        entity = cls[0].class_ if isinstance(cls, (tuple, list)) else cls
+        stmt = stmt.order_by(*order_by_(entity, order_by))
     return stmt
 
 
@@ -47,3 +57,27 @@ def exists(cls, **kwargs) -> Select:
     """
     stmt = select(cls).filter_by(**kwargs)
     return stmt
+
+
+def exists_many_(cls, fields: t.Sequence[str], values: t.Sequence[t.Any]) -> Select:
+    """Generate select of values present in table.
+
+    Args:
+        cls: table class
+        fields (t.Sequence[str]): key fields
+        values (t.Sequence[t.Any]): key values, tuples for multiple fields
+
+    Raises:
+        ValueError: field is not a mapped column
+
+    Returns:
+        Select: select of distinct key values
+    """
+    columns = [column for _, column in resolve_columns(cls, fields)]
+    if len(columns) == 1:
+        condition = columns[0].in_(values)
+    else:
+        condition = tuple_(*columns).in_(values)
+
+    stmt = select(*columns).where(condition).distinct()
+    return stmt
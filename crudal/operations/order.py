@@ -0,0 +1,87 @@
+import typing as t
+
+from sqlalchemy.inspection import inspect
+
+OrderBy = t.Union[str, t.Sequence[str]]
+
+_NULLS = ("first", "last")
+
+
+class OrderKey(t.NamedTuple):
+    """Parsed ordering of one field"""
+
+    field: str
+    descending: bool = False
+    nulls: t.Optional[str] = None
+
+
+def _parse_key(spec: str) -> OrderKey:
+    tokens = spec.split()
+    field = tokens[0] if tokens else ""
+    rest = [token.lower() for token in tokens[1:]]
+
+    descending = field.startswith("-")
+    if descending:
+        field = field[1:]
+    elif rest[:1] in (["asc"], ["desc"]):
+        descending = rest.pop(0) == "desc"
+
+    nulls = None
+    if len(rest) == 2 and rest[0] == "nulls" and rest[1] in _NULLS:
+        nulls = rest[1]
+        rest = []
+
+    if rest or not field:
+        raise ValueError(
+            f"Invalid order_by {spec!r}, expected "
+            "'[-]field [asc|desc] [nulls first|nulls last]'"
+        )
+
+    return OrderKey(field=field, descending=descending, nulls=nulls)
+
+
+def parse_order(order_by: t.Optional[OrderBy]) -> t.List[OrderKey]:
+    """Parse ordering specification.
+
+    Every item is a field name, prefixed with "-" or followed by "desc"
+    for descending order, optionally followed by "nulls first"
+    or "nulls last": `["-created_at nulls last", "name"]`.
+
+    Raises:
+        ValueError: invalid specification
+    """
+    if order_by is None:
+        return []
+    if isinstance(order_by, str):
+        order_by = [order_by]
+    return [_parse_key(spec) for spec in order_by]
+
+
+def order_by_(cls, order_by: t.Optional[OrderBy]) -> t.List[t.Any]:
+    """Generate ORDER BY clauses of table class.
+
+    Args:
+        cls: table class
+        order_by (t.Optional[OrderBy]): ordering specification, see `parse_order`
+
+    Raises:
+        ValueError: invalid specification or field is not a mapped column
+
+    Returns:
+        t.List[t.Any]: order by clauses
+    """
+    column_attrs = inspect(cls).column_attrs
+    clauses = []
+    for key in parse_order(order_by):
+        if key.field not in column_attrs:
+            raise ValueError(f"{cls.__name__} has no mapped column {key.field!r}")
+
+        clause = getattr(cls, key.field)
+        clause = clause.desc() if key.descending else clause.asc()
+        if key.nulls == "first":
+            clause = clause.nulls_first()
+        elif key.nulls == "last":
+            clause = clause.nulls_last()
+        clauses.append(clause)
+
+    return clauses
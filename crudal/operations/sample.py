@@ -0,0 +1,44 @@
+import typing as t
+
+from sqlalchemy import Select, TextClause, func, literal, select, tablesample, text
+from sqlalchemy.orm import aliased
+
+
+def pk_range_(cls, pk: str) -> Select:
+    """Generate select of smallest and largest primary key"""
+    column = getattr(cls, pk)
+    return select(func.min(column), func.max(column))
+
+
+def sample_probe_(cls, pk: str, ids: t.Sequence[int], **kwargs) -> Select:
+    """Generate select of rows with given primary keys and filters"""
+    return select(cls).where(getattr(cls, pk).in_(ids)).filter_by(**kwargs)
+
+
+def row_estimate_(cls) -> TextClause:
+    """Generate PostgreSQL query of planner estimate of table row count"""
+    stmt = text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)")
+    return stmt.bindparams(name=cls.__table__.fullname)
+
+
+def tablesample_(cls, percent: float, seed: t.Optional[int] = None, **kwargs) -> Select:
+    """Generate select of random table blocks (`TABLESAMPLE SYSTEM`).
+
+    Args:
+        cls: table class
+        percent (float): percent of table to read
+        seed (t.Optional[int], optional): `REPEATABLE` seed. Defaults to None.
+        **kwargs: search filters
+
+    Returns:
+        Select: select statement
+    """
+    sampled = aliased(
+        cls,
+        tablesample(
+            cls.__table__,
+            func.system(percent),
+            seed=None if seed is None else literal(seed),
+        ),
+    )
+    return select(sampled).filter_by(**kwargs)
@@ -0,0 +1,172 @@
+import typing as t
+
+from sqlalchemy import column, false, func, literal_column, select, table
+from sqlalchemy.engine import Dialect
+from sqlalchemy.inspection import inspect
+
+# text search configuration of PostgreSQL tsvector
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR = "search_vector"
+
+
+def _search_columns(cls) -> t.List[str]:
+    fields = getattr(cls, "__search_columns__", None)
+    if not fields:
+        raise ValueError(f"{cls.__name__} has no __search_columns__")
+
+    column_attrs = inspect(cls).column_attrs
+    names = []
+    for field in fields:
+        if field not in column_attrs:
+            raise ValueError(f"{cls.__name__} has no mapped column {field!r}")
+        names.append(column_attrs[field].columns[0].name)
+    return names
+
+
+def _fts_table(cls) -> str:
+    return f"{cls.__tablename__}_fts"
+
+
+def _check_dialect(dialect: Dialect) -> None:
+    if dialect.name not in ("sqlite", "postgresql"):
+        raise NotImplementedError(
+            f"Full-text search is not supported for {dialect.name}"
+        )
+
+
+def search_index_(cls, dialect: Dialect) -> t.List[str]:
+    """Generate DDL of full-text search index of table class.
+
+    SQLite: FTS5 external content table, kept in sync by triggers,
+    filled with existing rows. PostgreSQL: generated tsvector column
+    with GIN index.
+
+    Args:
+        cls: table class with `__search_columns__`
+        dialect (Dialect): database dialect
+
+    Raises:
+        ValueError: table class has no (valid) search columns
+        NotImplementedError: dialect has no full-text search support
+
+    Returns:
+        t.List[str]: SQL statements
+    """
+    _check_dialect(dialect)
+    quote = dialect.identifier_preparer.quote
+    columns = [quote(name) for name in _search_columns(cls)]
+    name = cls.__tablename__
+
+    if dialect.name == "postgresql":
+        document = " || ' ' || ".join(f"coalesce({c}::text, '')" for c in columns)
+        return [
+            f"ALTER TABLE {quote(name)} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR} "
+            f"tsvector GENERATED ALWAYS AS "
+            f"(to_tsvector('{SEARCH_CONFIG}', {document})) STORED",
+            f"CREATE INDEX IF NOT EXISTS {quote(f'ix_{name}_{SEARCH_VECTOR}')} "
+            f"ON {quote(name)} USING GIN ({SEARCH_VECTOR})",
+        ]
+
+    pk = quote(inspect(cls).primary_key[0].name)
+    fts = _fts_table(cls)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    delete_old = (
+        f"INSERT INTO {quote(fts)}({quote(fts)}, rowid, {names}) "
+        f"VALUES ('delete', old.{pk}, {old});"
+    )
+    insert_new = f"INSERT INTO {quote(fts)}(rowid, {names}) VALUES (new.{pk}, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {quote(fts)} USING fts5({names}, "
+        f"content='{name}', content_rowid='{inspect(cls).primary_key[0].name}')",
+        f"CREATE TRIGGER IF NOT EXISTS {quote(fts + '_ai')} AFTER INSERT "
+        f"ON {quote(name)} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {quote(fts + '_ad')} AFTER DELETE "
+        f"ON {quote(name)} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {quote(fts + '_au')} AFTER UPDATE "
+        f"ON {quote(name)} BEGIN {delete_old} {insert_new} END",
+        *search_rebuild_(cls, dialect),
+    ]
+
+
+def search_rebuild_(cls, dialect: Dialect) -> t.List[str]:
+    """Generate SQL rebuilding full-text search index of table class"""
+    _check_dialect(dialect)
+    quote = dialect.identifier_preparer.quote
+    if dialect.name == "postgresql":
+        return [f"REINDEX INDEX {quote(f'ix_{cls.__tablename__}_{SEARCH_VECTOR}')}"]
+
+    fts = quote(_fts_table(cls))
+    return [f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"]
+
+
+def search_(
+    cls,
+    dialect: Dialect,
+    query: str,
+    rows: t.Optional[int] = None,
+    offset: int = 0,
+    prefix: bool = False,
+):
+    """Generate full-text search statement, most relevant rows first.
+
+    Every word of query should match. User input is not parsed
+    as FTS5 / tsquery syntax.
+
+    Args:
+        cls: table class with `__search_columns__`
+        dialect (Dialect): database dialect
+        query (str): words to search
+        rows (t.Optional[int], optional): number of rows. Defaults to None.
+        offset (int, optional): number of rows to skip. Defaults to 0.
+        prefix (bool, optional): match words starting with query words.
+            Defaults to False.
+
+    Returns:
+        Select: search statement
+    """
+    _check_dialect(dialect)
+    _search_columns(cls)
+    terms = query.split()
+    if not terms:
+        return select(cls).where(false())
+
+    if dialect.name == "postgresql":
+        vector = literal_column(f"{cls.__tablename__}.{SEARCH_VECTOR}")
+        if prefix:
+            words = [term.replace("\\", "\\\\").replace("'", "''") for term in terms]
+            tsquery = func.to_tsquery(
+                SEARCH_CONFIG, " & ".join(f"'{word}':*" for word in words)
+            )
+        else:
+            tsquery = func.plainto_tsquery(SEARCH_CONFIG, query)
+        stmt = (
+            select(cls)
+            .where(vector.op("@@")(tsquery))
+            .order_by(func.ts_rank(vector, tsquery).desc())
+        )
+    else:
+        # quoted strings are FTS5 phrases, "*" makes prefix query
+        suffix = "*" if prefix else ""
+        match = " ".join('"' + term.replace('"', '""') + '"' + suffix for term in terms)
+        name = _fts_table(cls)
+        fts = table(name, column("rowid"), column("rank"))
+        pk = getattr(cls, cls._get_primary_key())
+        stmt = (
+            select(cls)
+            .join(fts, fts.c.rowid == pk)
+            .where(
+                literal_column(dialect.identifier_preparer.quote(name)).op("MATCH")(
+                    match
+                )
+            )
+            .order_by(fts.c.rank)
+        )
+
+    if offset:
+        stmt = stmt.offset(offset)
+    if rows is not None:
+        stmt = stmt.limit(rows)
+
+    return stmt
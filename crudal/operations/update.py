@@ -1,14 +1,120 @@
-from sqlalchemy import Update, update
+import typing as t
 
+from sqlalchemy import Update, bindparam, update
+from sqlalchemy.inspection import inspect
 
-def update_(cls, values: dict, **filters) -> Update:
+
+def update_(
+    cls, values: dict, expected_version: t.Optional[t.Any] = None, **filters
+) -> Update:
     """Generate update statement
 
+    If table class declares `__version_column__`, version is incremented
+    and, if `expected_version` is passed, only rows with this version
+    are updated.
+
+    Args:
+        values (dict): values to update
+        expected_version (t.Optional[t.Any], optional): version of rows
+            to update. Defaults to None.
+
+    Raises:
+        ValueError: `expected_version` passed, but table class
+            has no `__version_column__`
+
+    Returns:
+        Update: update statement
+    """
+    version = getattr(cls, "__version_column__", None)
+    if expected_version is not None and version is None:
+        raise ValueError(f"{cls.__name__} has no __version_column__")
+
+    stmt = update(cls).filter_by(**filters)
+
+    if version is not None:
+        column = getattr(cls, version)
+        if expected_version is not None:
+            stmt = stmt.where(column == expected_version)
+        values = {**values, version: column + 1}
+
+    stmt = stmt.values(**values)
+    return stmt
+
+
+def update_many_(cls, fields: t.Sequence[str]) -> Update:
+    """Generate update by primary key statement for executemany.
+
+    Parameters are `_pk` (primary key value), `_v_<field>` for every
+    updated field and `_expected` (expected version) if table class
+    declares `__version_column__`.
+
+    Args:
+        fields (t.Sequence[str]): updated fields
+
+    Returns:
+        Update: update statement
+    """
+    mapper = inspect(cls)
+    table = cls.__table__
+    pk_column = mapper.primary_key[0]
+
+    stmt = update(table).where(pk_column == bindparam("_pk"))
+    values = {
+        mapper.column_attrs[field].columns[0].name: bindparam(f"_v_{field}")
+        for field in fields
+    }
+
+    version = getattr(cls, "__version_column__", None)
+    if version is not None:
+        column = mapper.column_attrs[version].columns[0]
+        stmt = stmt.where(column == bindparam("_expected"))
+        values[column.name] = column + 1
+
+    stmt = stmt.values(values)
+    return stmt
+
+
+def update_bulk_(
+    cls, filter_fields: t.Sequence[str], value_fields: t.Sequence[str]
+) -> Update:
+    """Generate update statement for executemany.
+
+    Parameters are `_f_<field>` for every filter field
+    and `_v_<field>` for every updated field.
+
+    Args:
+        filter_fields (t.Sequence[str]): fields compared for equality
+        value_fields (t.Sequence[str]): updated fields
+
+    Returns:
+        Update: update statement
+    """
+    column_attrs = inspect(cls).column_attrs
+    stmt = update(cls.__table__).where(
+        *(
+            column_attrs[field].columns[0] == bindparam(f"_f_{field}")
+            for field in filter_fields
+        )
+    )
+    stmt = stmt.values(
+        {
+            column_attrs[field].columns[0].name: bindparam(f"_v_{field}")
+            for field in value_fields
+        }
+    )
+    return stmt
+
+
+def update_in_(cls, field: str, keys: t.Sequence[t.Any], values: dict) -> Update:
+    """Generate update statement of rows with field value in keys
+
     Args:
+        field (str): filter field
+        keys (t.Sequence[t.Any]): filter field values
         values (dict): values to update
 
     Returns:
         Update: update statement
     """
-    stmt = update(cls).filter_by(**filters).values(**values)
+    stmt = update(cls).where(getattr(cls, field).in_(keys)).values(**values)
     return stmt
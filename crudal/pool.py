@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+import typing as t
+import weakref
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import configure_mappers
+
+from crudal import operations
+from crudal.utils import factory_bind
+
+_monitors: "weakref.WeakKeyDictionary[t.Any, PoolMonitor]" = weakref.WeakKeyDictionary()
+
+_PING = text("SELECT 1")
+_NO_FETCH = {"stream_results": True}
+
+
+class PoolStats(t.NamedTuple):
+    """Connection pool statistics of table class (summed over shards).
+
+    Checkout time is time spent in getting connection from pool:
+    waiting for free connection or opening a new one.
+    """
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkout_time: float
+    max_checkout_time: float
+
+    @property
+    def avg_checkout_time(self) -> float:
+        return self.checkout_time / self.checkouts if self.checkouts else 0.0
+
+
+class PoolMonitor:
+    """Measure connection checkouts of engine pool.
+
+    Pool recreated by `engine.dispose()` is monitored too,
+    counters are kept.
+
+    Args:
+        engine (Engine): SQLAlchemy engine
+    """
+
+    def __init__(self, engine):
+        # weak reference, so that monitor doesn't keep engine alive
+        self._engine = weakref.ref(engine)
+        self.checkouts = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+        self._lock = threading.Lock()
+
+        self._wrap(engine.pool)
+        event.listen(engine, "engine_disposed", lambda e: self._wrap(e.pool))
+
+    @property
+    def pool(self):
+        return self._engine().pool
+
+    def _wrap(self, pool) -> None:
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.monotonic()
+            try:
+                return connect()
+            finally:
+                self._record(time.monotonic() - started)
+
+        pool.connect = timed_connect
+
+    def _record(self, elapsed: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_time += elapsed
+            self.max_checkout_time = max(self.max_checkout_time, elapsed)
+
+    def stats(self) -> PoolStats:
+        """Return current pool statistics"""
+
+        def count(name: str) -> int:
+            # not every pool class (StaticPool, NullPool, ...) keeps counters
+            method = getattr(self.pool, name, None)
+            return method() if method is not None else 0
+
+        return PoolStats(
+            size=count("size"),
+            checked_in=count("checkedin"),
+            checked_out=count("checkedout"),
+            overflow=max(count("overflow"), 0),
+            checkouts=self.checkouts,
+            checkout_time=self.checkout_time,
+            max_checkout_time=self.max_checkout_time,
+        )
+
+
+def _factories(model) -> t.List[t.Any]:
+    shards = getattr(model, "__shards__", None)
+    if shards is not None:
+        return list(shards.sessions)
+    if model.__session__ is None:
+        raise ValueError(f"{model.__name__} has no __session__")
+    return [model.__session__]
+
+
+def _group(models: t.Iterable[t.Any]) -> t.List[t.Tuple[t.Any, t.List[t.Any]]]:
+    """Group models by session factory"""
+    groups: t.Dict[int, t.Tuple[t.Any, t.List[t.Any]]] = {}
+    for model in models:
+        for factory in _factories(model):
+            groups.setdefault(id(factory), (factory, []))[1].append(model)
+    return list(groups.values())
+
+
+def monitor(factory) -> PoolMonitor:
+    """Return (attach once) monitor of session factory engine pool"""
+    bind = factory_bind(factory)
+    engine = getattr(bind, "sync_engine", bind)
+
+    pool_monitor = _monitors.get(engine)
+    if pool_monitor is None:
+        pool_monitor = _monitors[engine] = PoolMonitor(engine)
+    return pool_monitor
+
+
+def pool_stats(model) -> PoolStats:
+    """Return connection pool statistics of table class.
+
+    Checkouts are counted since the engine pool is first monitored
+    (by `warmup` or this function), including pools recreated
+    by `engine.dispose()`.
+
+    Args:
+        model: table class with `__session__` or `__shards__`
+    """
+    stats = [monitor(factory).stats() for factory in _factories(model)]
+    totals = [sum(values) for values in zip(*stats)]
+    totals[-1] = max(s.max_checkout_time for s in stats)
+    return PoolStats(*totals)
+
+
+def _warm_statements(model) -> t.List[t.Any]:
+    """Statements built by `find()` and `find_by_pk` of table class"""
+    stmts = [operations.find(model, offset=0)]
+    pk = model._get_primary_key()
+    try:
+        # any value of key type, results are never fetched
+        value = getattr(model, pk).type.python_type()
+    except Exception:
+        return stmts
+    stmts.append(operations.find(model, offset=0, **{pk: value}))
+    return stmts
+
+
+def warmup(models: t.Iterable[t.Any], connections: int = 1, compile: bool = True):
+    """Open pool connections of table classes before first requests.
+
+    Every session factory (class session or shard sessions) opens
+    `connections` connections at once and pings database with them,
+    connections are returned to pool afterwards.
+
+    Example:
+    ```
+    crudal.warmup([User, Account], connections=10)
+    ```
+
+    Args:
+        models (t.Iterable[t.Any]): table classes
+        connections (int, optional): Number of connections to open.
+            Defaults to 1.
+        compile (bool, optional): configure mappers and fill compiled cache
+            with statements of `find()` and `find_by_pk` of every table class.
+            They are executed without fetching rows. Defaults to True.
+    """
+    if compile:
+        configure_mappers()
+
+    for factory, factory_models in _group(models):
+        monitor(factory)
+        sessions = [factory() for _ in range(connections)]
+        try:
+            for session in sessions:
+                session.connection()
+            for session in sessions:
+                session.execute(_PING)
+            if compile:
+                for model in factory_models:
+                    for stmt in _warm_statements(model):
+                        sessions[0].execute(stmt, execution_options=_NO_FETCH).close()
+        finally:
+            for session in sessions:
+                session.close()
+
+
+async def warmup_async(
+    models: t.Iterable[t.Any], connections: int = 1, compile: bool = True
+):
+    """Async version of `warmup`, connections are opened concurrently.
+
+    Example:
+    ```
+    await crudal.warmup_async([User, Account], connections=10)
+    ```
+    """
+    if compile:
+        configure_mappers()
+
+    for factory, factory_models in _group(models):
+        monitor(factory)
+        sessions = [factory() for _ in range(connections)]
+        try:
+            await asyncio.gather(*(session.connection() for session in sessions))
+            await asyncio.gather(*(session.execute(_PING) for session in sessions))
+            if compile:
+                for model in factory_models:
+                    for stmt in _warm_statements(model):
+                        result = await sessions[0].stream(stmt)
+                        await result.close()
+        finally:
+            await asyncio.gather(*(session.close() for session in sessions))
@@ -0,0 +1,35 @@
+"""Pytest plugin with crudal fixtures.
+
+Enable it in `conftest.py`:
+```
+pytest_plugins = ["crudal.pytest_plugin"]
+```
+"""
+
+import pytest
+
+from crudal.diagnostics import QueryDetector
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "crudal_queries(threshold, raise_above): options of crudal_query_detector",
+    )
+
+
+@pytest.fixture
+def crudal_query_detector(request):
+    """Detect repeated crudal queries (N+1) in test.
+
+    Options are passed with `crudal_queries` marker:
+    ```
+    @pytest.mark.crudal_queries(raise_above=5)
+    def test_orders_page(crudal_query_detector):
+        ...
+    ```
+    """
+    marker = request.node.get_closest_marker("crudal_queries")
+    options = marker.kwargs if marker is not None else {}
+    with QueryDetector(**options) as detector:
+        yield detector
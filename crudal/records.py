@@ -0,0 +1,99 @@
+import typing as t
+
+from sqlalchemy.inspection import inspect
+
+_record_classes: t.Dict[type, t.Type["ReadonlyRecord"]] = {}
+
+
+class ReadonlyRecord:
+    """Immutable and hashable row of table class.
+
+    Holds values of all mapped columns in `__slots__`. Records are not
+    attached to session: no identity map, no change tracking,
+    no lazy loading.
+    """
+
+    __slots__ = ()
+    _fields: t.Tuple[str, ...] = ()
+    _columns: t.Tuple[t.Any, ...] = ()
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def _values(self) -> t.Tuple[t.Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def _asdict(self) -> t.Dict[str, t.Any]:
+        """Return record as dict"""
+        return dict(zip(self._fields, self._values()))
+
+    def __eq__(self, other: t.Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{k}={v!r}" for k, v in zip(self._fields, self._values()))
+        return f"{type(self).__name__}({values})"
+
+
+# names of record helpers, columns can't be stored in slots with these names
+_reserved: t.FrozenSet[str] = frozenset(dir(ReadonlyRecord))
+
+
+def _make_init(record_cls: type, fields: t.Sequence[str]) -> t.Callable:
+    # slot descriptors setters bypass read-only __setattr__
+    namespace = {
+        f"_set{i}": getattr(record_cls, name).__set__ for i, name in enumerate(fields)
+    }
+    args = ", ".join(f"v{i}" for i in range(len(fields)))
+    body = (
+        "\n".join(f"    _set{i}(self, v{i})" for i in range(len(fields))) or "    pass"
+    )
+    exec(f"def __init__(self, {args}):\n{body}\n", namespace)
+    return namespace["__init__"]
+
+
+def record_class(cls) -> t.Type[ReadonlyRecord]:
+    """Return (generate once) read-only record class of table class.
+
+    Args:
+        cls: table class
+
+    Raises:
+        ValueError: mapped column name clashes with record attribute
+            (like `_fields` or `_asdict`)
+
+    Returns:
+        t.Type[ReadonlyRecord]: record class, its constructor takes
+            column values in `_fields` order
+    """
+    record_cls = _record_classes.get(cls)
+    if record_cls is None:
+        fields = tuple(attr.key for attr in inspect(cls).column_attrs)
+        clashes = sorted(_reserved.intersection(fields))
+        if clashes:
+            raise ValueError(
+                f"{cls.__name__} columns {clashes} clash with read-only record "
+                "attributes, load ORM objects instead"
+            )
+        record_cls = type(
+            f"{cls.__name__}Record",
+            (ReadonlyRecord,),
+            {
+                "__slots__": fields,
+                "__module__": cls.__module__,
+                "_fields": fields,
+                "_columns": tuple(getattr(cls, name) for name in fields),
+            },
+        )
+        record_cls.__init__ = _make_init(record_cls, fields)
+        _record_classes[cls] = record_cls
+
+    return record_cls
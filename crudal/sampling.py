@@ -0,0 +1,78 @@
+import random
+import typing as t
+
+from sqlalchemy.inspection import inspect
+
+# rounds of primary key probing before falling back to full scan
+PROBE_ROUNDS = 8
+# most keys probed per missing row in one round
+PROBE_LIMIT = 16
+# read that many times more table blocks than needed with TABLESAMPLE
+OVERSAMPLE = 3
+
+
+def integer_pk(cls) -> t.Optional[str]:
+    """Return name of single integer primary key of table class, if any"""
+    primary_key = inspect(cls).primary_key
+    if len(primary_key) != 1:
+        return None
+    try:
+        python_type = primary_key[0].type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is not int:
+        return None
+    return inspect(cls).get_property_by_column(primary_key[0]).key
+
+
+def probe_count(missing: int, probed: int, found: int) -> int:
+    """Number of keys to probe to find `missing` rows.
+
+    Grows with share of missed keys (gaps, filtered out rows) in previous rounds.
+    """
+    ratio = min(2 * (probed + 1) / (found + 1), PROBE_LIMIT)
+    return int(missing * ratio) + 1
+
+
+def probe_ids(
+    rng: random.Random, low: int, high: int, count: int, seen: t.Set[int]
+) -> t.List[int]:
+    """Pick up to `count` random not yet probed keys in [low, high]"""
+    count = min(count, high - low + 1 - len(seen))
+    ids = []
+    while len(ids) < count:
+        value = rng.randint(low, high)
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+    return ids
+
+
+def tablesample_percent(estimate: float, n: int) -> float:
+    """Percent of table to read with TABLESAMPLE to get about `n` rows"""
+    return min(100.0, 100.0 * n * OVERSAMPLE / estimate)
+
+
+class Reservoir:
+    """Uniform random sample of stream of unknown length (algorithm R).
+
+    Args:
+        size (int): sample size
+        rng (random.Random): random generator
+    """
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.items: t.List[t.Any] = []
+        self.seen = 0
+
+    def extend(self, items: t.Iterable[t.Any]) -> None:
+        for item in items:
+            self.seen += 1
+            if len(self.items) < self.size:
+                self.items.append(item)
+                continue
+            index = self.rng.randrange(self.seen)
+            if index < self.size:
+                self.items[index] = item
@@ -0,0 +1,140 @@
+import datetime
+import decimal
+import json
+import typing as t
+import uuid
+
+from crudal.columnar import resolve_columns
+from crudal.export import json_default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_serializers: t.Dict[t.Tuple[t.Any, ...], "Serializer"] = {}
+
+# JSON encoders of column types not supported by json module
+_ENCODERS: t.Dict[type, t.Callable[[t.Any], t.Any]] = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+    decimal.Decimal: str,
+    uuid.UUID: str,
+}
+
+
+def _encoder(column) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+
+    encoder = _ENCODERS.get(python_type)
+    if encoder is None:
+        return None
+    return lambda value: None if value is None else encoder(value)
+
+
+def _compile(
+    fields: t.Sequence[str],
+    encoders: t.Sequence[t.Optional[t.Callable]],
+    by_key: bool,
+) -> t.Callable[[t.Any], t.Dict[str, t.Any]]:
+    namespace: t.Dict[str, t.Any] = {}
+    items = []
+    for i, (field, encoder) in enumerate(zip(fields, encoders)):
+        value = f"row[{field!r}]" if by_key else f"row.{field}"
+        if encoder is not None:
+            namespace[f"_e{i}"] = encoder
+            value = f"_e{i}({value})"
+        items.append(f"{field!r}: {value}")
+
+    exec(f"def to_dict(row):\n    return {{{', '.join(items)}}}\n", namespace)
+    return namespace["to_dict"]
+
+
+class Serializer:
+    """Convert rows of table class into dicts and JSON.
+
+    Converters are generated once from mapped columns: fields are read with
+    plain attribute (or key) access, without per-row reflection. Works with
+    ORM objects, read-only records, result rows and mappings.
+
+    Args:
+        cls: table class
+        fields (t.Optional[t.Sequence[str]], optional): fields to include.
+            Defaults to None - all mapped columns.
+        exclude (t.Optional[t.Sequence[str]], optional): fields to exclude.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        cls,
+        fields: t.Optional[t.Sequence[str]] = None,
+        exclude: t.Optional[t.Sequence[str]] = None,
+    ):
+        columns = resolve_columns(cls, fields)
+        if exclude:
+            columns = [(name, c) for name, c in columns if name not in exclude]
+
+        self.fields = [name for name, _ in columns]
+        no_encoding = [None] * len(columns)
+        encoders = [_encoder(c) for _, c in columns]
+        self._by_attr = _compile(self.fields, no_encoding, by_key=False)
+        self._by_key = _compile(self.fields, no_encoding, by_key=True)
+        self._json_by_attr = _compile(self.fields, encoders, by_key=False)
+        self._json_by_key = _compile(self.fields, encoders, by_key=True)
+
+    def _convert(self, rows: t.Iterable[t.Any], json_safe: bool) -> t.List[dict]:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return []
+
+        if isinstance(first, t.Mapping):
+            to_dict = self._json_by_key if json_safe else self._by_key
+        else:
+            to_dict = self._json_by_attr if json_safe else self._by_attr
+
+        result = [to_dict(first)]
+        result.extend(map(to_dict, rows))
+        return result
+
+    def to_dicts(self, rows: t.Iterable[t.Any]) -> t.List[t.Dict[str, t.Any]]:
+        """Convert rows into dicts, values are kept as is"""
+        return self._convert(rows, json_safe=False)
+
+    def to_json_bytes(self, rows: t.Iterable[t.Any]) -> bytes:
+        """Encode rows as JSON array.
+
+        Uses orjson when it is installed. Dates and times are encoded
+        in ISO format, decimals and UUIDs as strings.
+        """
+        if orjson is not None:
+            return orjson.dumps(
+                self._convert(rows, json_safe=False), default=json_default
+            )
+        return json.dumps(
+            self._convert(rows, json_safe=True),
+            default=json_default,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def serializer(
+    cls,
+    fields: t.Optional[t.Sequence[str]] = None,
+    exclude: t.Optional[t.Sequence[str]] = None,
+) -> Serializer:
+    """Return (generate once) serializer of table class and fields"""
+    key = (
+        cls,
+        None if fields is None else tuple(fields),
+        None if exclude is None else tuple(exclude),
+    )
+    result = _serializers.get(key)
+    if result is None:
+        result = _serializers[key] = Serializer(cls, fields=fields, exclude=exclude)
+    return result
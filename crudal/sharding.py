@@ -0,0 +1,352 @@
+import abc
+import array
+import asyncio
+import bisect
+import typing as t
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from crudal.exceptions import VersionConflictError
+from crudal.operations.order import OrderKey, parse_order
+from crudal.utils import factory_bind
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+_SessionFactory = t.Callable[[], t.Any]
+
+# dialects sorting NULLs as larger than any value, others sort them as smallest
+NULLS_LARGEST_DIALECTS = ("postgresql", "oracle")
+
+
+def no_scatter(f):
+    """Mark operation that can't run on all shards at once.
+
+    Such operation needs shard key in filters or explicit session.
+    """
+    f.__crudal_no_scatter__ = True
+    return f
+
+
+def _item_key(item: t.Any, key: str) -> t.Any:
+    if isinstance(item, t.Mapping):
+        return item[key]
+    return getattr(item, key)
+
+
+def _concat_columns(parts: t.Sequence[t.Any]) -> t.Any:
+    if numpy is not None and all(isinstance(p, numpy.ndarray) for p in parts):
+        return numpy.concatenate(parts)
+    typecodes = {p.typecode for p in parts if isinstance(p, array.array)}
+    if len(typecodes) == 1 and all(isinstance(p, array.array) for p in parts):
+        return array.array(typecodes.pop(), chain.from_iterable(parts))
+    return list(chain.from_iterable(parts))
+
+
+def _sort_key(
+    key: OrderKey, nulls_largest: bool
+) -> t.Callable[[t.Any], t.Tuple[int, t.Any]]:
+    if key.nulls:
+        nulls_first = key.nulls == "first"
+    else:
+        nulls_first = key.descending == nulls_largest
+    # reversed sort moves NULLs to the other end
+    null_rank = (-1 if nulls_first else 1) * (-1 if key.descending else 1)
+
+    def sort_key(item: t.Any) -> t.Tuple[int, t.Any]:
+        value = _item_key(item, key.field)
+        return (null_rank, 0) if value is None else (0, value)
+
+    return sort_key
+
+
+def sort_items(
+    items: t.List[t.Any], order: t.Sequence[OrderKey], nulls_largest: bool = False
+) -> t.List[t.Any]:
+    """Sort merged items in place as database would with same ORDER BY.
+
+    Args:
+        items (t.List[t.Any]): objects or mappings
+        order (t.Sequence[OrderKey]): parsed ordering
+        nulls_largest (bool, optional): place of NULLs if it is not set
+            in ordering: largest values (PostgreSQL) or smallest (SQLite, MySQL).
+            Defaults to False.
+    """
+    # stable sorts from the last key to the first one
+    for key in reversed(order):
+        items.sort(key=_sort_key(key, nulls_largest), reverse=key.descending)
+    return items
+
+
+class MergedResult(t.NamedTuple):
+    """Result of write operation (like `update`) run on several shards"""
+
+    rowcount: int
+
+
+class _Conflict(t.NamedTuple):
+    exc: VersionConflictError
+
+
+def merge(results: t.Sequence[t.Any]) -> t.Any:
+    """Merge results of one operation executed on several shards.
+
+    Lists are concatenated, flags are OR-ed, counts (and row counts
+    of write results) are summed, sets are joined and columns are concatenated.
+    From single item results (like `find_by_pk`) the found one is returned.
+    """
+    found = [r for r in results if r is not None]
+    if not found:
+        return None
+    if all(isinstance(r, bool) for r in found):
+        return any(found)
+    if all(isinstance(r, int) and not isinstance(r, bool) for r in found):
+        return sum(found)
+    if all(isinstance(r, (set, frozenset)) for r in found):
+        return set().union(*found)
+    if all(isinstance(r, list) for r in found):
+        return list(chain.from_iterable(found))
+    if all(isinstance(r, dict) for r in found):
+        return {k: _concat_columns([r[k] for r in found]) for k in found[0]}
+    if all(hasattr(r, "rowcount") for r in found):
+        return MergedResult(rowcount=sum(r.rowcount for r in found))
+    if len(found) == 1:
+        return found[0]
+    return found
+
+
+def _resolve_conflicts(results: t.List[t.Any]) -> t.List[t.Any]:
+    """Drop version conflicts of shards that don't hold updated rows.
+
+    Operation conflicts only if it found no rows on every shard.
+    """
+    passed = [r for r in results if not isinstance(r, _Conflict)]
+    if not passed:
+        raise results[0].exc
+    return passed
+
+
+class ShardSet(abc.ABC):
+    """Horizontal sharding declaration.
+
+    Set as `__shards__` of table class. Operations without explicit session
+    are routed by value of shard `key`: rows are added to their shard,
+    filters with shard key (or `find_by_pk` if key is primary key) go
+    to one shard, other queries run on all shards concurrently and
+    their results are merged.
+
+    Args:
+        key (str): shard key field
+        sessions (t.Sequence[_SessionFactory]): session factory of every shard
+    """
+
+    def __init__(self, key: str, sessions: t.Sequence[_SessionFactory]):
+        if not sessions:
+            raise ValueError("At least one shard session should be passed")
+        self.key = key
+        self.sessions = list(sessions)
+        # dialect names of shards, resolved on first sorted scatter query
+        self._dialects: t.Optional[t.Set[str]] = None
+
+    @abc.abstractmethod
+    def route(self, value: t.Any) -> int:
+        """Return shard index of shard key value"""
+
+    def _nulls_largest(self) -> bool:
+        """Whether shard databases sort NULLs as largest values"""
+        if self._dialects is None:
+            self._dialects = {
+                factory_bind(factory).dialect.name for factory in self.sessions
+            }
+
+        if len(self._dialects) > 1:
+            raise ValueError(
+                f"Shards have different dialects {sorted(self._dialects)}, "
+                "set 'nulls first' or 'nulls last' in order_by"
+            )
+        return next(iter(self._dialects)) in NULLS_LARGEST_DIALECTS
+
+    def _route_item(self, item: t.Any) -> int:
+        value = _item_key(item, self.key)
+        if value is None:
+            raise ValueError(
+                f"Shard key {self.key!r} is not set, it can't be generated "
+                f"by database of sharded table: {item!r}"
+            )
+        return self.route(value)
+
+    def session_for(self, value: t.Any) -> t.Any:
+        """Open session of shard which holds shard key value"""
+        return self.sessions[self.route(value)]()
+
+    def targets(
+        self, ref: t.Any, kwargs: t.Dict[str, t.Any]
+    ) -> t.List[t.Tuple[int, t.Dict[str, t.Any]]]:
+        """Return shards to run operation on and operation arguments for each.
+
+        Args:
+            ref: table class or item (for item methods like `add`)
+            kwargs (t.Dict[str, t.Any]): operation arguments
+        """
+        if not isinstance(ref, type):
+            return [(self._route_item(ref), kwargs)]
+
+        if "items" in kwargs:
+            groups: t.Dict[int, list] = {}
+            for item in kwargs["items"]:
+                groups.setdefault(self._route_item(item), []).append(item)
+            return [(idx, {**kwargs, "items": items}) for idx, items in groups.items()]
+
+        if "pk" in kwargs and ref._get_primary_key() == self.key:
+            return [(self.route(kwargs["pk"]), kwargs)]
+
+        if self.key in kwargs:
+            return [(self.route(kwargs[self.key]), kwargs)]
+
+        return [(idx, kwargs) for idx in range(len(self.sessions))]
+
+    def _scatter(
+        self, f: t.Callable, kwargs: t.Dict[str, t.Any]
+    ) -> t.Tuple[t.Dict[str, t.Any], t.Callable[[t.Any], t.Any]]:
+        """Adapt pagination of operation run on every shard.
+
+        Every shard returns first `offset + rows` rows in requested order,
+        merged rows are sorted and page is cut from them. NULLs are placed
+        as shard dialect sorts them, unless ordering sets their place.
+        """
+        if getattr(f, "__crudal_no_scatter__", False):
+            raise ValueError(
+                f"{f.__name__} of sharded model needs shard key or explicit session"
+            )
+
+        order = parse_order(kwargs.get("order_by"))
+        rows, offset = kwargs.get("rows"), kwargs.get("offset") or 0
+        if rows is None and not offset and not order:
+            return kwargs, merge
+
+        shard_kwargs = dict(kwargs)
+        if offset:
+            shard_kwargs["offset"] = 0
+        if rows is not None:
+            shard_kwargs["rows"] = offset + rows
+
+        nulls_largest = False
+        if any(key.nulls is None for key in order):
+            nulls_largest = self._nulls_largest()
+
+        def merge_page(results):
+            merged = merge(results)
+            if order and isinstance(merged, list):
+                sort_items(merged, order, nulls_largest=nulls_largest)
+            end = None if rows is None else offset + rows
+            if isinstance(merged, dict):
+                return {k: v[offset:end] for k, v in merged.items()}
+            if isinstance(merged, list):
+                return merged[offset:end]
+            return merged
+
+        return shard_kwargs, merge_page
+
+    def run_sync(self, f: t.Callable, ref: t.Any, kwargs: t.Dict[str, t.Any]) -> t.Any:
+        """Run sync operation on target shards"""
+
+        def run(idx: int, shard_kwargs: t.Dict[str, t.Any]) -> t.Any:
+            with self.sessions[idx]() as session:
+                return f(ref, session, **shard_kwargs)
+
+        def run_scattered(idx: int, shard_kwargs: t.Dict[str, t.Any]) -> t.Any:
+            try:
+                return run(idx, shard_kwargs)
+            except VersionConflictError as e:
+                return _Conflict(e)
+
+        targets = self.targets(ref, kwargs)
+        if not targets:
+            return None
+        if len(targets) == 1:
+            return run(*targets[0])
+
+        merge_results = merge
+        if "items" not in kwargs:
+            kwargs, merge_results = self._scatter(f, kwargs)
+            targets = [(idx, kwargs) for idx, _ in targets]
+
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [executor.submit(run_scattered, idx, kw) for idx, kw in targets]
+            return merge_results(_resolve_conflicts([f.result() for f in futures]))
+
+    async def run_async(
+        self, f: t.Callable, ref: t.Any, kwargs: t.Dict[str, t.Any]
+    ) -> t.Any:
+        """Run async operation on target shards concurrently"""
+
+        async def run(idx: int, shard_kwargs: t.Dict[str, t.Any]) -> t.Any:
+            async with self.sessions[idx]() as session:
+                return await f(ref, session, **shard_kwargs)
+
+        async def run_scattered(idx: int, shard_kwargs: t.Dict[str, t.Any]) -> t.Any:
+            try:
+                return await run(idx, shard_kwargs)
+            except VersionConflictError as e:
+                return _Conflict(e)
+
+        targets = self.targets(ref, kwargs)
+        if not targets:
+            return None
+        if len(targets) == 1:
+            return await run(*targets[0])
+
+        merge_results = merge
+        if "items" not in kwargs:
+            kwargs, merge_results = self._scatter(f, kwargs)
+            targets = [(idx, kwargs) for idx, _ in targets]
+
+        results = await asyncio.gather(*(run_scattered(idx, kw) for idx, kw in targets))
+        return merge_results(_resolve_conflicts(results))
+
+
+class HashShards(ShardSet):
+    """Route rows by stable hash of shard key.
+
+    Example:
+    ```
+    class User(DeclarativeCrudBase):
+        __tablename__ = "person"
+        __shards__ = HashShards("id", [SessionShard0, SessionShard1])
+    ```
+    """
+
+    def route(self, value: t.Any) -> int:
+        return zlib.crc32(str(value).encode("utf-8")) % len(self.sessions)
+
+
+class RangeShards(ShardSet):
+    """Route rows by ranges of shard key.
+
+    Example:
+    ```
+    class User(DeclarativeCrudBase):
+        __tablename__ = "person"
+        # ids below 1_000_000 in first shard, others in second
+        __shards__ = RangeShards("id", [(1_000_000, SessionA), (None, SessionB)])
+    ```
+
+    Args:
+        key (str): shard key field
+        ranges (t.Sequence[t.Tuple[t.Any, _SessionFactory]]): exclusive upper
+            bound of shard key and session factory of every shard,
+            in ascending order. Bound of the last shard may be None.
+    """
+
+    def __init__(self, key: str, ranges: t.Sequence[t.Tuple[t.Any, _SessionFactory]]):
+        super().__init__(key, [session for _, session in ranges])
+        self.bounds = [bound for bound, _ in ranges if bound is not None]
+
+    def route(self, value: t.Any) -> int:
+        idx = bisect.bisect_right(self.bounds, value)
+        if idx >= len(self.sessions):
+            raise ValueError(f"{self.key}={value!r} is out of shard ranges")
+        return idx
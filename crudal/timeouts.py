@@ -0,0 +1,131 @@
+import time
+import typing as t
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+
+from crudal.exceptions import StatementTimeoutError
+
+_DEADLINE = "crudal_deadline"
+
+# progress handler is called every N SQLite virtual machine instructions
+SQLITE_PROGRESS_STEPS = 1000
+
+
+def _remaining_ms(info: t.Dict[str, t.Any]) -> int:
+    return max(1, int((info[_DEADLINE] - time.monotonic()) * 1000))
+
+
+def _limit_connection(
+    info: t.Dict[str, t.Any], connection, restore: bool
+) -> t.Callable[[bool], None]:
+    """Enable dialect statement timeout on connection.
+
+    Returns function to disable it, called with True if transaction
+    has already ended.
+    """
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        dbapi_connection = connection.connection.driver_connection
+        dbapi_connection.set_progress_handler(
+            lambda: time.monotonic() > info[_DEADLINE], SQLITE_PROGRESS_STEPS
+        )
+        return lambda ended: dbapi_connection.set_progress_handler(None, 0)
+
+    if dialect == "postgresql":
+        previous = None
+        if restore:
+            previous = connection.exec_driver_sql("SHOW statement_timeout").scalar()
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {_remaining_ms(info)}"
+        )
+        if previous is None:
+            # SET LOCAL is reverted with transaction end
+            return lambda ended: None
+
+        def reset(ended: bool) -> None:
+            # SET LOCAL is reverted with transaction end
+            if ended or connection.closed or not connection.in_transaction():
+                return
+            try:
+                connection.exec_driver_sql(
+                    "SET LOCAL statement_timeout = '%s'" % previous.replace("'", "''")
+                )
+            except DBAPIError:
+                # aborted transaction, setting is reverted by its rollback
+                pass
+
+        return reset
+
+    return lambda ended: None
+
+
+@contextmanager
+def statement_timeout(
+    session, timeout: t.Optional[float], restore: bool = True
+) -> t.Iterator[None]:
+    """Bound execution time of statements of sync session.
+
+    Uses SQLite progress handler and PostgreSQL `statement_timeout`,
+    other dialects are not limited. Inside another timeout only
+    a shorter deadline takes effect.
+
+    Args:
+        session (Session): SQLAlchemy session
+        timeout (t.Optional[float]): timeout in seconds. None - no timeout.
+        restore (bool, optional): restore previous PostgreSQL timeout if
+            transaction continues after the block. Pass False when session
+            is closed with the block to skip reading it. Defaults to True.
+
+    Raises:
+        StatementTimeoutError: statement was interrupted after deadline
+    """
+    if timeout is None:
+        yield
+        return
+
+    info = session.info
+    deadline = time.monotonic() + timeout
+    outer_deadline = info.get(_DEADLINE)
+    if outer_deadline is not None and outer_deadline <= deadline:
+        yield
+        return
+
+    info[_DEADLINE] = deadline
+    disable: t.List[t.Callable[[bool], None]] = []
+
+    def on_begin(session, transaction, connection):
+        disable.append(_limit_connection(info, connection, restore))
+
+    def on_end(session, transaction):
+        # after_commit / after_rollback also fire for savepoints
+        if transaction.parent is None:
+            # connection is returned to pool, remove limit now
+            for f in disable:
+                f(True)
+            disable.clear()
+
+    try:
+        if outer_deadline is None:
+            event.listen(session, "after_begin", on_begin)
+            event.listen(session, "after_transaction_end", on_end)
+            if session.in_transaction():
+                disable.append(_limit_connection(info, session.connection(), restore))
+        yield
+    except DBAPIError as e:
+        if time.monotonic() >= deadline:
+            raise StatementTimeoutError(
+                f"Statement timed out after {timeout} seconds"
+            ) from e
+        raise
+    finally:
+        if outer_deadline is None:
+            event.remove(session, "after_begin", on_begin)
+            event.remove(session, "after_transaction_end", on_end)
+            for f in disable:
+                f(False)
+            del info[_DEADLINE]
+        else:
+            info[_DEADLINE] = outer_deadline
@@ -0,0 +1,425 @@
+import typing as t
+from contextvars import ContextVar
+from functools import wraps
+
+from sqlalchemy.schema import sort_tables
+from sqlalchemy.sql.elements import ClauseElement
+
+from crudal import operations
+from crudal.exceptions import VersionConflictError
+from crudal.utils import chunks
+
+# max number of values in one IN (...) clause
+IN_CHUNK_SIZE = 1000
+
+_current: ContextVar[t.Optional["Batch"]] = ContextVar("crudal_batch", default=None)
+
+
+class Operation(t.NamedTuple):
+    """Recorded crudal operation"""
+
+    name: str
+    model: type
+    kwargs: t.Dict[str, t.Any]
+
+
+class Step(t.NamedTuple):
+    """Statement executed when batch is flushed.
+
+    `add` steps add ORM items of one table and flush them,
+    `execute` steps execute statement (with executemany params, if any).
+    """
+
+    kind: str
+    model: type
+    stmt: t.Any = None
+    params: t.Any = None
+    version_check: bool = False
+
+
+def batchable_sync(f):
+    """Decorator to record operation called without session in active batch."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        current = _current.get()
+        if current is not None and len(args) < 2:
+            return current.record(f.__name__, args[0], kwargs)
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def batchable_async(f):
+    """Decorator to record operation called without session in active batch."""
+
+    @wraps(f)
+    async def wrapper(*args, **kwargs):
+        current = _current.get()
+        if current is not None and len(args) < 2:
+            return current.record(f.__name__, args[0], kwargs)
+        return await f(*args, **kwargs)
+
+    return wrapper
+
+
+def _filters(op: Operation) -> t.Dict[str, t.Any]:
+    reserved = ("values", "expected_version", "commit", "statement_timeout")
+    return {k: v for k, v in op.kwargs.items() if k not in reserved}
+
+
+def _bindable(values: t.Iterable[t.Any]) -> bool:
+    return all(v is not None and not isinstance(v, ClauseElement) for v in values)
+
+
+def _shape(model: type, op: Operation) -> t.Optional[t.Tuple[t.Any, ...]]:
+    """Return key of operations that can be merged with this one.
+
+    None - operation is executed as is.
+    """
+    if op.name == "add_many":
+        return ("add_many",)
+
+    filters = _filters(op)
+    if not filters or not _bindable(filters.values()):
+        return None
+
+    if op.name == "update":
+        values = op.kwargs["values"]
+        if model.__version_column__ is not None or not _bindable(values.values()):
+            return None
+        return ("update", tuple(sorted(filters)), tuple(sorted(values)))
+
+    return ("delete", tuple(sorted(filters)))
+
+
+def _runs(
+    model: type, ops: t.Sequence[Operation]
+) -> t.List[t.Tuple[t.Optional[t.Tuple[t.Any, ...]], t.List[Operation]]]:
+    """Split operations of one table into runs of adjacent mergeable operations"""
+    runs: t.List[t.Tuple[t.Optional[t.Tuple[t.Any, ...]], t.List[Operation]]] = []
+    for op in ops:
+        shape = _shape(model, op)
+        if shape is not None and runs and runs[-1][0] == shape:
+            runs[-1][1].append(op)
+        else:
+            runs.append((shape, [op]))
+    return runs
+
+
+def _update_steps(model: type, ops: t.List[Operation], merge: bool) -> t.List[Step]:
+    """Execute updates of one table.
+
+    Run of updates with same filter and value fields becomes one executemany
+    statement, or one `IN` statement if they also set same values
+    by single field.
+    """
+    if not merge:
+        (op,) = ops
+        expected_version = op.kwargs.get("expected_version")
+        stmt = operations.update_(
+            model,
+            values=op.kwargs["values"],
+            expected_version=expected_version,
+            **_filters(op),
+        )
+        return [
+            Step(
+                "execute", model, stmt=stmt, version_check=expected_version is not None
+            )
+        ]
+
+    group = [(_filters(op), op.kwargs["values"]) for op in ops]
+    filter_fields = tuple(sorted(group[0][0]))
+    value_fields = tuple(sorted(group[0][1]))
+    steps = []
+    same_values = all(values == group[0][1] for _, values in group)
+    if len(filter_fields) == 1 and same_values:
+        (field,) = filter_fields
+        keys = [filters[field] for filters, _ in group]
+        for chunk in chunks(keys, IN_CHUNK_SIZE):
+            stmt = operations.update_in_(model, field, chunk, group[0][1])
+            steps.append(Step("execute", model, stmt=stmt))
+        return steps
+
+    params = [
+        {
+            **{f"_f_{k}": v for k, v in filters.items()},
+            **{f"_v_{k}": v for k, v in values.items()},
+        }
+        for filters, values in group
+    ]
+    stmt = operations.update_bulk_(model, filter_fields, value_fields)
+    return [Step("execute", model, stmt=stmt, params=params)]
+
+
+def _delete_steps(model: type, ops: t.List[Operation], merge: bool) -> t.List[Step]:
+    """Execute deletes of one table, run of them as `IN` or executemany statement"""
+    group = [_filters(op) for op in ops]
+    steps = []
+    if model.__tombstones__ is not None:
+        for filters in group:
+            stmt = operations.tombstones_(model, **filters)
+            steps.append(Step("execute", model, stmt=stmt))
+
+    if not merge:
+        (filters,) = group
+        return steps + [
+            Step("execute", model, stmt=operations.delete_(model, **filters))
+        ]
+
+    filter_fields = tuple(sorted(group[0]))
+    if len(filter_fields) == 1:
+        (field,) = filter_fields
+        keys = [filters[field] for filters in group]
+        for chunk in chunks(keys, IN_CHUNK_SIZE):
+            stmt = operations.delete_in_(model, field, chunk)
+            steps.append(Step("execute", model, stmt=stmt))
+        return steps
+
+    params = [{f"_f_{k}": v for k, v in filters.items()} for filters in group]
+    stmt = operations.delete_bulk_(model, filter_fields)
+    steps.append(Step("execute", model, stmt=stmt, params=params))
+    return steps
+
+
+def _run_steps(
+    model: type, shape: t.Optional[t.Tuple[t.Any, ...]], ops: t.List[Operation]
+) -> t.List[Step]:
+    name = ops[0].name
+    if name == "add_many":
+        items = [item for op in ops for item in op.kwargs["items"]]
+        return [Step("add", model, params=items)] if items else []
+    if name == "update":
+        return _update_steps(model, ops, merge=shape is not None)
+    return _delete_steps(model, ops, merge=shape is not None)
+
+
+def _segments(recorded: t.Sequence[Operation]) -> t.List[t.List[Operation]]:
+    """Split operations where some table switches between deletes and writes.
+
+    Segments are executed in recorded order, so a row deleted and inserted
+    again (with its child rows) is deleted first.
+    """
+    segments: t.List[t.List[Operation]] = [[]]
+    deletes: t.Dict[t.Any, bool] = {}
+    for op in recorded:
+        table = op.model.__table__
+        is_delete = op.name == "delete"
+        if deletes.get(table, is_delete) != is_delete:
+            segments.append([])
+            deletes = {}
+        deletes[table] = is_delete
+        segments[-1].append(op)
+    return segments
+
+
+def plan(recorded: t.Sequence[Operation]) -> t.List[Step]:
+    """Order and merge recorded operations.
+
+    Operations are split into segments where some table switches between
+    deletes and inserts / updates, segments keep recorded order. Inside
+    segment operations of one table keep recorded order, adjacent operations
+    of same kind and shape are merged, inserts and updates run from parent
+    to child tables, then deletes from child to parent tables.
+
+    Args:
+        recorded (t.Sequence[Operation]): recorded operations
+
+    Returns:
+        t.List[Step]: steps to execute
+    """
+    steps = []
+    for segment in _segments(recorded):
+        by_table: t.Dict[t.Any, t.List[Operation]] = {}
+        models: t.Dict[t.Any, type] = {}
+        for op in segment:
+            table = op.model.__table__
+            models.setdefault(table, op.model)
+            by_table.setdefault(table, []).append(op)
+
+        tables = sort_tables(by_table)
+        writes = [table for table in tables if by_table[table][0].name != "delete"]
+        deletes = [
+            table for table in reversed(tables) if by_table[table][0].name == "delete"
+        ]
+        for table in writes + deletes:
+            for shape, ops in _runs(models[table], by_table[table]):
+                steps.extend(_run_steps(models[table], shape, ops))
+
+    return steps
+
+
+def _check(step: Step, result: t.Any) -> None:
+    if step.version_check and result.rowcount == 0:
+        raise VersionConflictError(
+            f"{step.model.__name__} rows were changed or deleted"
+        )
+
+
+def _run_sync(session, steps: t.Sequence[Step]) -> None:
+    for step in steps:
+        if step.kind == "add":
+            session.add_all(step.params)
+            session.flush()
+        elif step.params is not None:
+            _check(step, session.execute(step.stmt, step.params))
+        else:
+            _check(step, session.execute(step.stmt))
+
+
+async def _run_async(session, steps: t.Sequence[Step]) -> None:
+    for step in steps:
+        if step.kind == "add":
+            session.add_all(step.params)
+            await session.flush()
+        elif step.params is not None:
+            _check(step, await session.execute(step.stmt, step.params))
+        else:
+            _check(step, await session.execute(step.stmt))
+
+
+class Batch:
+    """Unit of work recording crudal operations.
+
+    `add`, `add_many`, `update` and `delete` called without session inside
+    `with` (`async with`) block are recorded instead of executed. At block
+    exit adjacent operations of one table are merged into executemany / `IN`
+    statements, tables are ordered by foreign keys and everything is executed
+    in one transaction. Operations of one table keep recorded order. When
+    some table switches between deletes and inserts / updates, operations
+    recorded before the switch run first.
+
+    Recorded `add` returns item, other recorded operations return None.
+
+    Args:
+        session (optional): session to execute in. Defaults to None -
+            session of batched models `__session__`.
+        commit (bool, optional): commit after execution. Defaults to True.
+    """
+
+    def __init__(self, session: t.Any = None, commit: bool = True):
+        self.session = session
+        self.commit = commit
+        self.operations: t.List[Operation] = []
+        self.statements = 0
+        self._factory = None
+        self._token = None
+
+    def record(self, name: str, ref: t.Any, kwargs: t.Dict[str, t.Any]) -> t.Any:
+        """Record operation of table class (or item, for `add`)"""
+        model = ref if isinstance(ref, type) else type(ref)
+        if getattr(model, "__shards__", None) is not None:
+            raise ValueError(f"Sharded model {model.__name__} can't be batched")
+
+        if self.session is None:
+            factory = model.__session__
+            if factory is None:
+                raise ValueError(f"{model.__name__} has no __session__")
+            if self._factory is None:
+                self._factory = factory
+            elif self._factory is not factory:
+                raise ValueError(
+                    "Batched models have different __session__, pass session to batch"
+                )
+
+        if (
+            name == "update"
+            and kwargs.get("expected_version") is not None
+            and getattr(model, "__version_column__", None) is None
+        ):
+            raise ValueError(f"{model.__name__} has no __version_column__")
+
+        if name == "add":
+            self.operations.append(Operation("add_many", model, {"items": [ref]}))
+            return ref
+        if name == "add_many":
+            kwargs = {**kwargs, "items": list(kwargs["items"])}
+
+        self.operations.append(Operation(name, model, kwargs))
+        return None
+
+    def _take_steps(self) -> t.List[Step]:
+        steps = plan(self.operations)
+        self.operations = []
+        self.statements += len(steps)
+        return steps
+
+    def flush(self) -> None:
+        """Execute recorded operations"""
+        steps = self._take_steps()
+        if not steps:
+            return
+
+        if self.session is not None:
+            _run_sync(self.session, steps)
+            if self.commit:
+                self.session.commit()
+            return
+
+        with self._factory() as session:
+            _run_sync(session, steps)
+            if self.commit:
+                session.commit()
+
+    async def aflush(self) -> None:
+        """Execute recorded operations in async session"""
+        steps = self._take_steps()
+        if not steps:
+            return
+
+        if self.session is not None:
+            await _run_async(self.session, steps)
+            if self.commit:
+                await self.session.commit()
+            return
+
+        async with self._factory() as session:
+            await _run_async(session, steps)
+            if self.commit:
+                await session.commit()
+
+    def __enter__(self) -> "Batch":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.operations = []
+            return
+        self.flush()
+
+    async def __aenter__(self) -> "Batch":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.operations = []
+            return
+        await self.aflush()
+
+
+def batch(session: t.Any = None, commit: bool = True) -> Batch:
+    """Group crudal operations into one transaction with merged statements.
+
+    Example:
+    ```
+    with crudal.batch() as b:
+        User(name="Andrew").add()
+        Order.update(values={"status": "paid"}, id=1)
+        Order.update(values={"status": "paid"}, id=2)
+        Cart.delete(user_id=1)
+    # 1 insert, 1 update ... where id in (1, 2), 1 delete
+    ```
+
+    Args:
+        session (optional): session to execute in. Defaults to None -
+            session of batched models `__session__`.
+        commit (bool, optional): commit after execution. Defaults to True.
+
+    Returns:
+        Batch: unit of work, usable with `with` and `async with`
+    """
+    return Batch(session=session, commit=commit)
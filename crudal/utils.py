@@ -1,6 +1,9 @@
+import asyncio
 import typing as t
 from functools import wraps
 
+from crudal.exceptions import StatementTimeoutError
+from crudal.timeouts import statement_timeout
 from crudal.types import CRUDALType
 
 T = t.TypeVar("T", bound=CRUDALType)
@@ -8,6 +11,27 @@ _RT = t.TypeVar("_RT")  # return type
 P = t.ParamSpec("P")
 
 
+def chunks(values: t.Sequence[t.Any], size: int) -> t.Iterator[t.Sequence[t.Any]]:
+    """Split sequence into chunks of size"""
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def factory_bind(factory: t.Callable[[], t.Any]) -> t.Any:
+    """Return engine of session factory (sessionmaker or async_sessionmaker)"""
+    bind = getattr(factory, "kw", {}).get("bind")
+    if bind is not None:
+        return bind
+
+    # session without connection, closing it does no I/O
+    session = factory()
+    session = getattr(session, "sync_session", session)
+    try:
+        return session.get_bind()
+    finally:
+        session.close()
+
+
 def with_session_sync(f: t.Callable[P, _RT]) -> t.Callable[P, _RT]:
     """Decorator to handle session."""
 
@@ -19,16 +43,34 @@ def with_session_sync(f: t.Callable[P, _RT]) -> t.Callable[P, _RT]:
         else:
             session = None
 
+        timeout = kwargs.pop("statement_timeout", getattr(ref, "__timeout__", None))
+
+        @wraps(f)
+        def call(ref, session, **kwargs):
+            with statement_timeout(session, timeout):
+                return f(ref, session, **kwargs)
+
+        @wraps(f)
+        def call_closing(ref, session, **kwargs):
+            # session is closed after operation, no need to restore its settings
+            with statement_timeout(session, timeout, restore=False):
+                return f(ref, session, **kwargs)
+
         # if session is passed as argument
         # use it
         if session is not None:
-            return f(ref, session, **kwargs)
+            return call(ref, session, **kwargs)
+
+        # if class is sharded
+        # route operation to its shards
+        elif getattr(ref, "__shards__", None) is not None:
+            return ref.__shards__.run_sync(call_closing, ref, kwargs)
 
         # if session is not passed as argument
         # and class has __session__ attribute
         elif session is None and ref.__session__ is not None:
             with ref.__session__() as session:
-                return f(ref, session, **kwargs)
+                return call_closing(ref, session, **kwargs)
         else:
             raise ValueError("Neither function session or class session exists")
 
@@ -38,6 +80,24 @@ def with_session_sync(f: t.Callable[P, _RT]) -> t.Callable[P, _RT]:
 def with_session_async(f: t.Callable[P, _RT]) -> t.Callable[P, _RT]:
     """Decorator to handle session."""
 
+    async def run(ref, session, **kwargs):
+        # if session is passed as argument
+        if session is not None:
+            return await f(ref, session, **kwargs)
+
+        # if class is sharded
+        # route operation to its shards
+        elif getattr(ref, "__shards__", None) is not None:
+            return await ref.__shards__.run_async(f, ref, kwargs)
+
+        # if session is not passed as argument
+        # and class has __session__ attribute
+        elif session is None and ref.__session__ is not None:
+            async with ref.__session__() as session:
+                return await f(ref, session, **kwargs)
+        else:
+            raise ValueError("Neither function session or class session exists")
+
     @wraps(f)
     async def wrapper(*args: P.args, **kwargs: P.kwargs):
         ref = args[0]
@@ -46,15 +106,75 @@ def with_session_async(f: t.Callable[P, _RT]) -> t.Callable[P, _RT]:
         else:
             session = None
 
-        # if session is passed as argument
+        timeout = kwargs.pop("statement_timeout", getattr(ref, "__timeout__", None))
+        if timeout is None:
+            return await run(ref, session, **kwargs)
+
+        # cancel operation (and its statement, if driver supports it)
+        try:
+            return await asyncio.wait_for(run(ref, session, **kwargs), timeout)
+        except asyncio.TimeoutError as e:
+            raise StatementTimeoutError(
+                f"{f.__name__} timed out after {timeout} seconds"
+            ) from e
+
+    return wrapper
+
+
+def with_session_sync_iter(
+    f: t.Callable[P, t.Iterator[_RT]]
+) -> t.Callable[P, t.Iterator[_RT]]:
+    """Decorator to handle session of generator.
+
+    Class session is kept open until generator is exhausted or closed.
+    """
+
+    @wraps(f)
+    def wrapper(*args: P.args, **kwargs: P.kwargs):
+        ref = args[0]
+        if len(args) >= 2:
+            session = args[1]
+        else:
+            session = None
+
         if session is not None:
-            return await f(ref, session, **kwargs)
+            yield from f(ref, session, **kwargs)
+        elif getattr(ref, "__shards__", None) is not None:
+            raise ValueError("Pass shard session to iterate over sharded model")
+        elif session is None and ref.__session__ is not None:
+            with ref.__session__() as session:
+                yield from f(ref, session, **kwargs)
+        else:
+            raise ValueError("Neither function session or class session exists")
 
-        # if session is not passed as argument
-        # and class has __session__ attribute
+    return wrapper
+
+
+def with_session_async_iter(
+    f: t.Callable[P, t.AsyncIterator[_RT]]
+) -> t.Callable[P, t.AsyncIterator[_RT]]:
+    """Decorator to handle session of async generator.
+
+    Class session is kept open until generator is exhausted or closed.
+    """
+
+    @wraps(f)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs):
+        ref = args[0]
+        if len(args) >= 2:
+            session = args[1]
+        else:
+            session = None
+
+        if session is not None:
+            async for item in f(ref, session, **kwargs):
+                yield item
+        elif getattr(ref, "__shards__", None) is not None:
+            raise ValueError("Pass shard session to iterate over sharded model")
         elif session is None and ref.__session__ is not None:
             async with ref.__session__() as session:
-                return await f(ref, session, **kwargs)
+                async for item in f(ref, session, **kwargs):
+                    yield item
         else:
             raise ValueError("Neither function session or class session exists")
 
@@ -0,0 +1,18 @@
+import pytest
+
+import crudal
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_batch(async_model_ws: DeclarativeCrudBaseAsync, random_string):
+    async with crudal.batch() as b:
+        p = await async_model_ws(name=random_string).add()
+        await async_model_ws.add_many(
+            items=[async_model_ws(name=random_string) for _ in range(2)]
+        )
+        await async_model_ws.update(values={"name": "Renamed"}, name=random_string)
+
+    assert b.statements == 2
+    assert p.id is not None
+    assert await async_model_ws.find(name=random_string) == []
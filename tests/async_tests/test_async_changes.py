@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_changes_since(
+    async_feed_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    docs = [async_feed_model(title="doc", revision=i) for i in range(3)]
+    await async_feed_model.add_many(async_session, items=docs, commit=True)
+
+    batches = [
+        batch
+        async for batch in async_feed_model.changes_since(
+            async_session, watermark=0, batch=1
+        )
+    ]
+
+    assert [b.items[0].revision for b in batches] == [1, 2]
+    assert batches[-1].watermark.value == 2
+
+
+@pytest.mark.asyncio
+async def test_changes_since_same_session(
+    async_feed_model: DeclarativeCrudBaseAsync,
+    async_session: AsyncSession,
+    random_string,
+):
+    doc = await async_feed_model(title=random_string, revision=200).add(
+        async_session, commit=True
+    )
+    (batch,) = [
+        b
+        async for b in async_feed_model.changes_since(
+            async_session, title=random_string
+        )
+    ]
+
+    async with AsyncSession(bind=async_session.bind) as other:
+        await async_feed_model.update(other, values={"revision": 500}, id=doc.id)
+        await other.commit()
+
+    (batch,) = [
+        b
+        async for b in async_feed_model.changes_since(
+            async_session, watermark=batch.watermark, title=random_string
+        )
+    ]
+    assert batch.watermark == (500, doc.id)
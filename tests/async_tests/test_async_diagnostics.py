@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+from crudal.diagnostics import QueryDetector
+
+
+@pytest.mark.asyncio
+async def test_query_detector(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    with QueryDetector() as detector:
+        for pk in range(3):
+            await async_model.find_by_pk(async_session, pk=pk)
+
+    (finding,) = detector.report()
+    assert finding.count == 3
+    assert finding.call_sites[0].startswith(__file__)
+
+
+@pytest.mark.asyncio
+async def test_query_detector_other_task(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    async def run_queries(n: int):
+        async with AsyncSession(bind=async_session.bind) as session:
+            for pk in range(n):
+                await async_model.find_by_pk(session, pk=pk)
+
+    other = asyncio.create_task(run_queries(3))
+    with QueryDetector() as detector:
+        await asyncio.gather(other, run_queries(2))
+
+    assert sum(detector.shapes.values()) == 2
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync, IndexAdvisor
+
+
+@pytest.mark.asyncio
+async def test_explain(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    plan = await async_model.explain(async_session, name="Andrew")
+    assert "SCAN" in " ".join(plan)
+
+
+@pytest.mark.asyncio
+async def test_index_advisor(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    with IndexAdvisor() as advisor:
+        await async_model.explain(async_session, name="Andrew")
+        await async_model.delete(async_session, name="Not existing")
+        async for _ in async_model.find_iter(async_session, name="Andrew"):
+            pass
+
+    (suggestion,) = advisor.report()
+    assert suggestion.count == 2
@@ -0,0 +1,48 @@
+import io
+import json
+import threading
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    p = await async_model(name=random_string).add(async_session, commit=True)
+
+    buffer = io.StringIO()
+    exported = await async_model.export(
+        async_session, file=buffer, format="jsonl", name=random_string
+    )
+
+    assert exported == 1
+    assert json.loads(buffer.getvalue()) == {"id": p.id, "name": random_string}
+
+
+@pytest.mark.asyncio
+async def test_export_file_not_in_event_loop(
+    async_model: DeclarativeCrudBaseAsync,
+    async_session: AsyncSession,
+    random_string,
+    tmp_path,
+):
+    await async_model(name=random_string).add(async_session, commit=True)
+
+    class ThreadRecorder(io.StringIO):
+        threads = set()
+
+        def write(self, s):
+            self.threads.add(threading.get_ident())
+            return super().write(s)
+
+    buffer = ThreadRecorder()
+    await async_model.export(async_session, file=buffer, name=random_string)
+    assert threading.get_ident() not in buffer.threads
+
+    path = tmp_path / "people.csv"
+    await async_model.export(async_session, file=path, name=random_string)
+    assert path.read_bytes().decode() == buffer.getvalue()
@@ -25,3 +25,79 @@ async def test_find_by_pk(
     p_found = await async_model.find_by_pk(async_session, pk=item_id)
     assert p_found is not None
     assert p_found == p
+
+
+@pytest.mark.asyncio
+async def test_find_columns(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    await async_model.add_many(
+        async_session,
+        items=[async_model(name=random_string), async_model(name=random_string)],
+        commit=True,
+    )
+
+    columns = await async_model.find_columns(
+        async_session, fields=["id", "name"], batch_size=1, name=random_string
+    )
+    found = await async_model.find(async_session, name=random_string)
+
+    assert list(columns["id"]) == [p.id for p in found]
+    assert columns["name"] == [random_string, random_string]
+
+
+@pytest.mark.asyncio
+async def test_find_readonly(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    p = await async_model(name=random_string).add(async_session, commit=True)
+
+    (record,) = await async_model.find(async_session, readonly=True, name=random_string)
+    assert (record.id, record.name) == (p.id, p.name)
+    assert record == await async_model.find_by_pk(async_session, pk=p.id, readonly=True)
+    assert record in await async_model.all(async_session, readonly=True)
+
+
+@pytest.mark.asyncio
+async def test_exists_many(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    p = await async_model(name=random_string).add(async_session, commit=True)
+
+    found = await async_model.exists_many(
+        async_session, columns=["id", "name"], values=[(p.id, random_string), (0, "")]
+    )
+    assert found == {(p.id, random_string)}
+
+
+@pytest.mark.asyncio
+async def test_find_order_by(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    await async_model.add_many(
+        async_session,
+        items=[async_model(name=random_string) for _ in range(3)],
+        commit=True,
+    )
+    ids = [p.id for p in await async_model.find(async_session, name=random_string)]
+
+    found = await async_model.find(
+        async_session, rows=2, order_by="-id", name=random_string
+    )
+    assert [p.id for p in found] == sorted(ids, reverse=True)[:2]
+
+    found = [
+        p
+        async for p in async_model.find_iter(
+            async_session, batch_size=2, order_by="id desc", name=random_string
+        )
+    ]
+    assert [p.id for p in found] == sorted(ids, reverse=True)
+
+    records = [
+        p
+        async for p in async_model.find_iter(
+            async_session, readonly=True, order_by="id", name=random_string
+        )
+    ]
+    assert [p.id for p in records] == sorted(ids)
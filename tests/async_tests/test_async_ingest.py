@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_ingest_async_iterator(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    async def records():
+        for _ in range(3):
+            yield {"name": random_string}
+        yield {"name": None}
+
+    result = await async_model.ingest(
+        async_session, source=records(), batch_size=2, on_error="skip", commit=True
+    )
+
+    assert result == (3, 1, 0)
+    assert len(await async_model.find(async_session, name=random_string)) == 3
+
+
+@pytest.mark.asyncio
+async def test_ingest_jsonl(
+    async_model: DeclarativeCrudBaseAsync,
+    async_session: AsyncSession,
+    random_string,
+    tmp_path,
+):
+    path = tmp_path / "persons.jsonl"
+    path.write_text(f'{{"name": "{random_string}"}}\n{{"name": \n')
+
+    result = await async_model.ingest(
+        async_session, source=path, on_error="skip", commit=True
+    )
+
+    assert result == (1, 1, 0)
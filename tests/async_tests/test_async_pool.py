@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import crudal
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_warmup(async_model: DeclarativeCrudBaseAsync, tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=2
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(DeclarativeCrudBaseAsync.metadata.create_all)
+
+    async_model.__session__ = async_sessionmaker(engine)
+    try:
+        await crudal.warmup_async([async_model], connections=2)
+
+        stats = crudal.pool_stats(async_model)
+        assert (stats.checked_in, stats.checked_out) == (2, 0)
+        assert stats.checkouts >= 2
+
+        cached = len(engine.sync_engine._compiled_cache)
+        await async_model.find()
+        await async_model.find_by_pk(pk=1)
+        assert len(engine.sync_engine._compiled_cache) == cached
+        assert crudal.pool_stats(async_model).checkouts == stats.checkouts + 2
+    finally:
+        async_model.__session__ = None
+        await engine.dispose()
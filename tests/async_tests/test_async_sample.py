@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_sample(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    await async_model.add_many(
+        async_session,
+        items=[async_model(name=random_string) for _ in range(10)],
+        commit=True,
+    )
+
+    sample = await async_model.sample(async_session, n=3, seed=7, name=random_string)
+    assert len({p.id for p in sample}) == 3
+    assert sample == await async_model.sample(
+        async_session, n=3, seed=7, name=random_string
+    )
+    assert len(await async_model.sample(async_session, n=30, name=random_string)) == 10
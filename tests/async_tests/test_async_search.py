@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+class ArticleAsync(DeclarativeCrudBaseAsync):
+    __tablename__ = "article"
+    __search_columns__ = ("title", "body")
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[str] = mapped_column(String, nullable=True)
+
+
+@pytest.mark.asyncio
+async def test_search(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'search.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(DeclarativeCrudBaseAsync.metadata.create_all)
+
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        await ArticleAsync.create_search_index(session, commit=True)
+        await ArticleAsync.add_many(
+            session,
+            items=[
+                ArticleAsync(title="Sharding", body="split rows between databases"),
+                ArticleAsync(title="Databases", body="databases and more databases"),
+            ],
+            commit=True,
+        )
+
+        found = await ArticleAsync.search(session, query="databases")
+        assert [a.title for a in found] == ["Databases", "Sharding"]
+        found = await ArticleAsync.search(session, query="shard", prefix=True)
+        assert [a.title for a in found] == ["Sharding"]
+
+    await engine.dispose()
@@ -0,0 +1,19 @@
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+
+
+@pytest.mark.asyncio
+async def test_to_json_bytes(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    await async_model(name=random_string).add(async_session, commit=True)
+    found = await async_model.find(async_session, readonly=True, name=random_string)
+
+    assert async_model.to_dicts(found, fields=["name"]) == [{"name": random_string}]
+    assert json.loads(async_model.to_json_bytes(found)) == [
+        {"id": found[0].id, "name": random_string}
+    ]
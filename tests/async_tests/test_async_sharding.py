@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from crudal import DeclarativeCrudBaseAsync
+from crudal.sharding import HashShards
+
+
+class ShardedPersonAsync(DeclarativeCrudBaseAsync):
+    __tablename__ = "sharded_person"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+
+
+@pytest.mark.asyncio
+async def test_hash_shards(tmp_path):
+    engines, sessions = [], []
+    for i in range(2):
+        shard_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / f'shard{i}.db'}"
+        )
+        engines.append(shard_engine)
+        async with shard_engine.begin() as conn:
+            await conn.run_sync(DeclarativeCrudBaseAsync.metadata.create_all)
+        sessions.append(async_sessionmaker(shard_engine, expire_on_commit=False))
+
+    ShardedPersonAsync.__shards__ = HashShards("id", sessions)
+    try:
+        persons = [ShardedPersonAsync(id=i, name="Andrew") for i in range(6)]
+        await ShardedPersonAsync.add_many(items=persons, commit=True)
+
+        found = await ShardedPersonAsync.find(name="Andrew")
+        assert sorted(p.id for p in found) == list(range(6))
+        assert (await ShardedPersonAsync.find_by_pk(pk=4)).id == 4
+    finally:
+        ShardedPersonAsync.__shards__ = None
+        for shard_engine in engines:
+            await shard_engine.dispose()
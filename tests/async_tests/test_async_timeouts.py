@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crudal import DeclarativeCrudBaseAsync
+from crudal.exceptions import StatementTimeoutError
+from crudal.utils import with_session_async
+
+
+@with_session_async
+async def slow(cls, session, *, delay: float):
+    await asyncio.sleep(delay)
+
+
+@pytest.mark.asyncio
+async def test_timeout(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    with pytest.raises(StatementTimeoutError):
+        await slow(async_model, async_session, delay=1, statement_timeout=0.01)
+
+    await slow(async_model, async_session, delay=0, statement_timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_model_timeout(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession, random_string
+):
+    await async_model(name=random_string).add(async_session, commit=True)
+
+    async_model.__timeout__ = 0.01
+    try:
+        with pytest.raises(StatementTimeoutError):
+            await slow(async_model, async_session, delay=1)
+
+        # argument overrides model timeout
+        assert len(
+            await async_model.find(
+                async_session, statement_timeout=5, name=random_string
+            )
+        )
+    finally:
+        async_model.__timeout__ = None
@@ -2,6 +2,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crudal import DeclarativeCrudBaseAsync
+from crudal.exceptions import VersionConflictError
 
 
 @pytest.mark.asyncio
@@ -21,3 +22,29 @@ async def test_async_update(
 
     assert len(p_new) == 1
     assert p.id == p_new[0].id
+
+
+@pytest.mark.asyncio
+async def test_async_update_many_version_conflict(
+    async_versioned_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    a = await async_versioned_model(balance=10).add(async_session, commit=True)
+
+    await async_versioned_model.update_many(
+        async_session, items=[{"id": a.id, "balance": 20, "version": 1}]
+    )
+
+    with pytest.raises(VersionConflictError):
+        await async_versioned_model.update(
+            async_session, values=dict(balance=30), expected_version=1, id=a.id
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_update_expected_version_unversioned(
+    async_model: DeclarativeCrudBaseAsync, async_session: AsyncSession
+):
+    with pytest.raises(ValueError):
+        await async_model.update(
+            async_session, values=dict(name="John"), expected_version=1, id=1
+        )
@@ -8,6 +8,9 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Mapped, Session, mapped_column, sessionmaker
 
 from crudal import DeclarativeCrudBase, DeclarativeCrudBaseAsync
+from crudal.changes import tombstone_table
+
+pytest_plugins = ["crudal.pytest_plugin"]
 
 engine = create_engine("sqlite://")
 SessionLocal = sessionmaker(engine, expire_on_commit=False)
@@ -30,6 +33,25 @@ class PersonSession(Person):
     __session__ = SessionLocal
 
 
+class Account(DeclarativeCrudBase):
+    __tablename__ = "account"
+    __version_column__ = "version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+
+class Document(DeclarativeCrudBase):
+    __tablename__ = "document"
+    __watermark_column__ = "revision"
+    __tombstones__ = tombstone_table(DeclarativeCrudBase.metadata)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+
 class PersonAsync(DeclarativeCrudBaseAsync):
     __tablename__ = "person"
 
@@ -41,6 +63,25 @@ class PersonAsyncSession(PersonAsync):
     __session__ = SessionLocalAsync
 
 
+class AccountAsync(DeclarativeCrudBaseAsync):
+    __tablename__ = "account"
+    __version_column__ = "version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+
+class DocumentAsync(DeclarativeCrudBaseAsync):
+    __tablename__ = "document"
+    __watermark_column__ = "revision"
+    __tombstones__ = tombstone_table(DeclarativeCrudBaseAsync.metadata)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+
 @pytest.fixture()
 def async_model():
     return PersonAsync
@@ -52,6 +93,18 @@ def async_model_ws():
     return PersonAsyncSession
 
 
+@pytest.fixture()
+def async_versioned_model():
+    """Async model with version column"""
+    return AccountAsync
+
+
+@pytest.fixture()
+def async_feed_model():
+    """Async model with watermark column and tombstones"""
+    return DocumentAsync
+
+
 @pytest.fixture()
 def sync_model():
     return Person
@@ -63,6 +116,18 @@ def sync_model_ws():
     return PersonSession
 
 
+@pytest.fixture()
+def sync_versioned_model():
+    """Sync model with version column"""
+    return Account
+
+
+@pytest.fixture()
+def sync_feed_model():
+    """Sync model with watermark column and tombstones"""
+    return Document
+
+
 @pytest.fixture
 def session():
     with Session(bind=engine) as session:
@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
+
+import crudal
+from crudal import DeclarativeCrudBase
+
+
+class Author(DeclarativeCrudBase):
+    __tablename__ = "author"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class Book(DeclarativeCrudBase):
+    __tablename__ = "book"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("author.id"))
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+
+@pytest.fixture
+def library(tmp_path):
+    library_engine = create_engine(f"sqlite:///{tmp_path / 'library.db'}")
+    event.listen(
+        library_engine,
+        "connect",
+        lambda connection, _: connection.execute("PRAGMA foreign_keys = ON"),
+    )
+    DeclarativeCrudBase.metadata.create_all(bind=library_engine)
+    Author.__session__ = Book.__session__ = sessionmaker(
+        library_engine, expire_on_commit=False
+    )
+    yield Author, Book
+    Author.__session__ = Book.__session__ = None
+
+
+def test_batch(library):
+    Author, Book = library
+
+    with crudal.batch() as b:
+        # child table recorded first
+        Book(id=1, author_id=1, title="A").add()
+        Book.add_many(items=[Book(id=i, author_id=1, title="B") for i in range(2, 5)])
+        Author(id=1, name="Andrew").add()
+        assert Book.find() == []
+
+    assert b.statements == 2
+    assert len(Book.find(author_id=1)) == 4
+
+    with crudal.batch() as b:
+        for i in range(1, 4):
+            Book.update(values={"title": "C"}, id=i)
+        Book.update(values={"title": "D"}, id=4, author_id=1)
+        Book.delete(id=1)
+        Book.delete(id=2)
+
+    assert b.statements == 3
+    assert sorted((book.id, book.title) for book in Book.all()) == [(3, "C"), (4, "D")]
+
+
+def test_batch_rolls_back_on_error(library):
+    Author, _ = library
+
+    with pytest.raises(RuntimeError):
+        with crudal.batch():
+            Author(id=2, name="John").add()
+            raise RuntimeError()
+
+    assert Author.find_by_pk(pk=2) is None
+
+
+def test_batch_expected_version_unversioned(library):
+    Author, _ = library
+
+    with pytest.raises(ValueError):
+        with crudal.batch():
+            Author.update(values={"name": "a"}, expected_version=1, id=1)
+
+
+def test_batch_keeps_table_order(library):
+    Author, _ = library
+    Author(id=3, name="X").add(commit=True)
+
+    with crudal.batch():
+        Author.delete(id=3)
+        Author(id=3, name="Y").add()
+
+    assert Author.find_by_pk(pk=3).name == "Y"
+
+    with crudal.batch() as b:
+        Author.update(values={"name": "a"}, name="Y")
+        Author.update(values={"name": "b"}, id=3)
+        Author.update(values={"name": "c"}, name="b")
+
+    assert b.statements == 3
+    assert Author.find_by_pk(pk=3).name == "c"
+
+
+def test_batch_replace_parent(library):
+    Author, Book = library
+    Author(id=5, name="Old").add(commit=True)
+
+    with crudal.batch():
+        Author.delete(id=5)
+        Author(id=5, name="New").add()
+        Book(id=50, author_id=5, title="A").add()
+
+    assert Author.find_by_pk(pk=5).name == "New"
+    assert [book.id for book in Book.find(author_id=5)] == [50]
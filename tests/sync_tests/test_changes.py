@@ -0,0 +1,49 @@
+from sqlalchemy.orm import Session
+
+
+def test_changes_since(sync_feed_model, session: Session, random_string):
+    start = sync_feed_model.changes_since(session)
+    watermark = None
+    for batch in start:
+        watermark = batch.watermark
+
+    docs = [sync_feed_model(title=random_string, revision=100) for _ in range(3)]
+    sync_feed_model.add_many(session, items=docs, commit=True)
+
+    batches = list(sync_feed_model.changes_since(session, watermark=watermark, batch=2))
+
+    assert [len(b.items) for b in batches] == [2, 1]
+    assert [d.id for b in batches for d in b.items] == sorted(d.id for d in docs)
+    assert batches[-1].watermark == (100, docs[-1].id)
+    assert (
+        list(sync_feed_model.changes_since(session, watermark=batches[-1].watermark))
+        == []
+    )
+
+
+def test_changes_since_same_session(sync_feed_model, session: Session, random_string):
+    doc = sync_feed_model(title=random_string, revision=200).add(session, commit=True)
+    (batch,) = sync_feed_model.changes_since(session, title=random_string)
+    assert batch.watermark == (200, doc.id)
+
+    with Session(bind=session.get_bind()) as other:
+        sync_feed_model.update(other, values={"revision": 500}, id=doc.id)
+        other.commit()
+
+    (batch,) = sync_feed_model.changes_since(
+        session, watermark=batch.watermark, title=random_string
+    )
+    assert batch.items[0].revision == 500
+    assert batch.watermark == (500, doc.id)
+
+
+def test_deletions_since(sync_feed_model, session: Session, random_string):
+    watermark = 0
+    for batch in sync_feed_model.deletions_since(session):
+        watermark = batch.watermark
+
+    doc = sync_feed_model(title=random_string, revision=1).add(session, commit=True)
+    sync_feed_model.delete(session, title=random_string, commit=True)
+
+    (batch,) = sync_feed_model.deletions_since(session, watermark=watermark)
+    assert batch.items == [str(doc.id)]
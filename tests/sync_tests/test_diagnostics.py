@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import Session
+
+from crudal.diagnostics import QueryDetector
+from crudal.exceptions import QueryPatternError
+
+
+def test_query_detector(sync_model, session: Session):
+    with QueryDetector(threshold=3) as detector:
+        for pk in range(3):
+            sync_model.find_by_pk(session, pk=pk)
+        sync_model.find(session, name="Andrew")
+        sync_model.find(session, name="Andrew")
+
+    repeated, identical = detector.report()
+    assert (repeated.kind, repeated.count) == ("repeated", 3)
+    assert "person.id" in repeated.sql
+    assert repeated.call_sites[0].startswith(__file__)
+    assert (identical.kind, identical.count) == ("identical", 2)
+
+
+def test_query_detector_raise(sync_model, session: Session):
+    with pytest.raises(QueryPatternError):
+        with QueryDetector(raise_above=2):
+            for pk in range(3):
+                sync_model.find_by_pk(session, pk=pk)
+
+
+@pytest.mark.crudal_queries(threshold=2)
+def test_query_detector_fixture(sync_model, session: Session, crudal_query_detector):
+    sync_model.exists(session, name="Andrew")
+    sync_model.exists(session, name="John")
+
+    assert [f.kind for f in crudal_query_detector.report()] == ["repeated"]
+
+
+def test_query_detector_other_thread(sync_model, session: Session):
+    def run_queries():
+        # every thread has own in-memory database
+        sync_model.metadata.create_all(bind=session.get_bind())
+        with Session(bind=session.get_bind()) as thread_session:
+            with QueryDetector() as thread_detector:
+                for pk in range(3):
+                    sync_model.find_by_pk(thread_session, pk=pk)
+        return thread_detector
+
+    with QueryDetector() as detector:
+        sync_model.find_by_pk(session, pk=1)
+        with ThreadPoolExecutor(1) as executor:
+            thread_detector = executor.submit(run_queries).result()
+
+    assert sum(detector.shapes.values()) == 1
+    assert sum(thread_detector.shapes.values()) == 3
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from crudal import IndexAdvisor
+
+
+def test_explain(sync_model, session: Session):
+    assert "SCAN" in " ".join(sync_model.explain(session, name="Andrew"))
+    assert "SEARCH" in " ".join(sync_model.explain(session, op="delete", id=1))
+
+
+def test_index_advisor(sync_model, session: Session):
+    with IndexAdvisor() as advisor:
+        sync_model.find(session, name="Andrew")
+        sync_model.find(session, name="John")
+        sync_model.find_by_pk(session, pk=1)
+        sync_model.update(session, values={"name": "Bob"}, id=1)
+
+    sync_model.find(session, name="Not recorded")
+
+    (suggestion,) = advisor.report()
+    assert suggestion.model is sync_model
+    assert suggestion.columns == ("name",)
+    assert suggestion.count == 2
+
+
+def test_index_advisor_other_thread(sync_model, session: Session):
+    def run_queries():
+        # every thread has own in-memory database
+        sync_model.metadata.create_all(bind=session.get_bind())
+        with Session(bind=session.get_bind()) as thread_session:
+            sync_model.find(thread_session, name="John")
+
+    with IndexAdvisor() as advisor:
+        sync_model.find(session, name="Andrew")
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(run_queries).result()
+
+    (suggestion,) = advisor.report()
+    assert suggestion.count == 1
+
+
+def test_index_advisor_counts_operations(sync_model, session: Session):
+    with IndexAdvisor() as advisor:
+        sync_model.explain(session, name="Andrew")
+        sync_model.delete(session, name="Not existing")
+        list(sync_model.find_iter(session, name="Andrew"))
+        sync_model.exists_many(session, columns="name", values=["Andrew", "John"])
+
+    (suggestion,) = advisor.report()
+    assert suggestion.count == 3
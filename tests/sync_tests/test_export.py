@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+from sqlalchemy.orm import Session
+
+
+def test_export_csv(sync_model, session: Session, random_string, tmp_path):
+    p = sync_model(name=random_string)
+    p.add(session, commit=True)
+
+    path = tmp_path / "persons.csv"
+    exported = sync_model.export(session, file=path, name=random_string)
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert exported == 1
+    assert rows == [{"id": str(p.id), "name": random_string}]
+
+
+def test_export_jsonl(sync_model, session: Session, random_string):
+    sync_model.add_many(
+        session,
+        items=[sync_model(name=random_string), sync_model(name=random_string)],
+        commit=True,
+    )
+
+    progress = []
+    buffer = io.StringIO()
+    sync_model.export(
+        session,
+        file=buffer,
+        format="jsonl",
+        fields=["name"],
+        batch_size=1,
+        progress=progress.append,
+        name=random_string,
+    )
+
+    lines = buffer.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [{"name": random_string}] * 2
+    assert [p.rows for p in progress] == [1, 2]
@@ -1,4 +1,9 @@
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from crudal import DeclarativeCrudBase
+from crudal.columnar import ColumnCollector, resolve_columns
 
 
 def test_find(sync_model, session: Session):
@@ -18,3 +23,126 @@ def test_find_by_pk(sync_model, session: Session):
     p_found = sync_model.find_by_pk(session, pk=item_id)
     assert p_found is not None
     assert p_found == p
+
+
+def test_find_columns(sync_model, session: Session, random_string):
+    sync_model.add_many(
+        session,
+        items=[sync_model(name=random_string), sync_model(name=random_string)],
+        commit=True,
+    )
+
+    columns = sync_model.find_columns(
+        session, fields=["id", "name"], batch_size=1, name=random_string
+    )
+    found = sync_model.find(session, name=random_string)
+
+    assert list(columns["id"]) == [p.id for p in found]
+    assert columns["name"] == [random_string, random_string]
+
+
+def test_find_columns_unknown_field(sync_model, session: Session):
+    with pytest.raises(ValueError):
+        sync_model.find_columns(session, fields=["not_a_column"])
+
+
+def test_column_collector_out_of_range(sync_model):
+    collector = ColumnCollector(resolve_columns(sync_model, ["id"]))
+    collector.extend([(1,), (2,)])
+    collector.extend([(2**70,)])
+
+    assert list(collector.finish()["id"]) == [1, 2, 2**70]
+
+
+def test_find_readonly(sync_model, session: Session, random_string):
+    p = sync_model(name=random_string)
+    p.add(session, commit=True)
+
+    (record,) = sync_model.find(session, readonly=True, name=random_string)
+    assert (record.id, record.name) == (p.id, p.name)
+    assert record == sync_model.find_by_pk(session, pk=p.id, readonly=True)
+    assert record in sync_model.all(session, readonly=True)
+    assert hash(record) == hash(sync_model.find_by_pk(session, pk=p.id, readonly=True))
+
+    with pytest.raises(AttributeError):
+        record.name = "John"
+
+
+class Measure(DeclarativeCrudBase):
+    __tablename__ = "measure"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    _values: Mapped[str] = mapped_column("values", String)
+
+
+def test_find_readonly_reserved_column(session: Session):
+    with pytest.raises(ValueError, match="_values"):
+        Measure.find(session, readonly=True)
+
+
+def test_exists_many(sync_model, session: Session, random_string):
+    p = sync_model(name=random_string)
+    p.add(session, commit=True)
+
+    names = [random_string, "Not " + random_string, random_string]
+    assert sync_model.exists_many(
+        session, columns="name", values=names, chunk_size=1
+    ) == {random_string}
+
+    keys = [(p.id, random_string), (p.id, "Not " + random_string)]
+    assert sync_model.exists_many(session, columns=["id", "name"], values=keys) == {
+        (p.id, random_string)
+    }
+
+
+def test_exists_many_unknown_field(sync_model, session: Session):
+    with pytest.raises(ValueError):
+        sync_model.exists_many(session, columns=["id", "not_a_column"], values=[])
+    with pytest.raises(ValueError):
+        sync_model.exists_many(session, columns="_get_primary_key", values=[1])
+
+
+def test_find_order_by(sync_model, session: Session, random_string):
+    sync_model.add_many(
+        session,
+        items=[sync_model(name=random_string) for _ in range(3)],
+        commit=True,
+    )
+    ids = [p.id for p in sync_model.find(session, name=random_string)]
+
+    found = sync_model.find(
+        session, rows=2, order_by=["-id nulls last"], name=random_string
+    )
+    assert [p.id for p in found] == sorted(ids, reverse=True)[:2]
+
+    found = sync_model.find(
+        session, readonly=True, order_by=["name", "id desc"], name=random_string
+    )
+    assert [p.id for p in found] == sorted(ids, reverse=True)
+    assert sync_model.all(session, order_by="-id")[0].id == max(
+        p.id for p in sync_model.all(session)
+    )
+
+    with pytest.raises(ValueError):
+        sync_model.find(session, order_by="unknown")
+    with pytest.raises(ValueError):
+        sync_model.find(session, order_by="name sideways")
+
+
+def test_find_iter(sync_model, session: Session, random_string):
+    sync_model.add_many(
+        session,
+        items=[sync_model(name=random_string) for _ in range(5)],
+        commit=True,
+    )
+
+    found = list(
+        sync_model.find_iter(session, batch_size=2, order_by="-id", name=random_string)
+    )
+    assert len(found) == 5
+    assert [p.id for p in found] == sorted((p.id for p in found), reverse=True)
+
+    records = list(
+        sync_model.find_iter(session, readonly=True, rows=3, name=random_string)
+    )
+    assert len(records) == 3
@@ -0,0 +1,41 @@
+from sqlalchemy.orm import Session
+
+from crudal.ingest import IngestResult
+
+
+def test_ingest_csv_skip_bad_rows(
+    sync_model, session: Session, random_string, tmp_path
+):
+    existing = sync_model(name="Andrew").add(session, commit=True)
+    path = tmp_path / "persons.csv"
+    # second row fails conversion, third violates primary key constraint
+    path.write_text(
+        f"id,full_name\n,{random_string}\nnot a number,{random_string}\n"
+        f"{existing.id},{random_string}\n,{random_string}\n"
+    )
+
+    result = sync_model.ingest(
+        session,
+        source=path,
+        mapping={"full_name": "name"},
+        on_error="skip",
+        commit=True,
+    )
+
+    assert result == IngestResult(inserted=2, skipped=2, rejected=0)
+    assert len(sync_model.find(session, name=random_string)) == 2
+
+
+def test_ingest_iterator_reject_batch(sync_model, session: Session, random_string):
+    records = [{"name": random_string}] * 3 + [{"id": "not a number"}]
+
+    result = sync_model.ingest(
+        session,
+        source=iter(records),
+        batch_size=2,
+        on_error="reject_batch",
+        commit=True,
+    )
+
+    assert result == (2, 0, 2)
+    assert len(sync_model.find(session, name=random_string)) == 2
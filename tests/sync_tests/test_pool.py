@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+import crudal
+from crudal import DeclarativeCrudBase
+
+
+def test_warmup(sync_model, tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=3
+    )
+    DeclarativeCrudBase.metadata.create_all(bind=engine)
+
+    sync_model.__session__ = sessionmaker(engine)
+    try:
+        crudal.warmup([sync_model], connections=3)
+
+        stats = crudal.pool_stats(sync_model)
+        assert (stats.size, stats.checked_in, stats.checked_out) == (3, 3, 0)
+        assert stats.checkouts >= 3
+        assert 0 < stats.max_checkout_time <= stats.checkout_time
+
+        # statements of find and find_by_pk are already compiled
+        cached = len(engine._compiled_cache)
+        sync_model.find()
+        sync_model.find_by_pk(pk=1)
+        assert len(engine._compiled_cache) == cached
+
+        sync_model.find(name="Andrew")
+        stats_after = crudal.pool_stats(sync_model)
+        assert stats_after.checkouts == stats.checkouts + 3
+        # pooled connection was reused
+        assert stats_after.checked_in == 3
+
+        # counters survive pool recreation
+        engine.dispose()
+        sync_model.find(name="Andrew")
+        stats_disposed = crudal.pool_stats(sync_model)
+        assert stats_disposed.checkouts == stats_after.checkouts + 1
+        assert stats_disposed.checked_in == 1
+    finally:
+        sync_model.__session__ = None
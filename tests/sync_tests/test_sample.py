@@ -0,0 +1,38 @@
+import random
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from crudal import operations
+from crudal.sampling import Reservoir
+
+
+def test_sample(sync_model, session: Session, random_string):
+    sync_model.add_many(
+        session,
+        items=[sync_model(name=random_string) for _ in range(20)],
+        commit=True,
+    )
+
+    sample = sync_model.sample(session, n=5, seed=1, name=random_string)
+    assert len({p.id for p in sample}) == 5
+    assert all(p.name == random_string for p in sample)
+    assert sample == sync_model.sample(session, n=5, seed=1, name=random_string)
+
+    # not enough rows - all of them are returned
+    assert len(sync_model.sample(session, n=50, name=random_string)) == 20
+    assert sync_model.sample(session, n=5, name=random_string + "-missing") == []
+
+
+def test_reservoir():
+    reservoir = Reservoir(10, random.Random(1))
+    reservoir.extend(range(1000))
+    assert len(set(reservoir.items)) == 10
+    assert max(reservoir.items) >= 10
+
+
+def test_tablesample(sync_model):
+    stmt = operations.tablesample_(sync_model, 1.5, seed=7, name="Andrew")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "TABLESAMPLE system" in sql
+    assert "REPEATABLE" in sql
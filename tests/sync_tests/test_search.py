@@ -0,0 +1,53 @@
+from sqlalchemy import Integer, String, create_engine
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from crudal import DeclarativeCrudBase
+
+
+class Article(DeclarativeCrudBase):
+    __tablename__ = "article"
+    __search_columns__ = ("title", "body")
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[str] = mapped_column(String, nullable=True)
+
+
+def test_search(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    DeclarativeCrudBase.metadata.create_all(bind=engine)
+
+    with Session(bind=engine, expire_on_commit=False) as session:
+        # rows added before index are indexed on creation
+        Article(title="Sharding", body="split rows between databases").add(session)
+        Article.create_search_index(session, commit=True)
+
+        Article.add_many(
+            session,
+            items=[
+                Article(title="Databases", body="databases and more databases"),
+                Article(title="Cooking", body=None),
+            ],
+            commit=True,
+        )
+
+        found = Article.search(session, query="databases")
+        assert [a.title for a in found] == ["Databases", "Sharding"]
+        page = Article.search(session, query="databases", rows=1, offset=1)
+        assert [a.title for a in page] == ["Sharding"]
+        assert Article.search(session, query="cook") == []
+        assert [
+            a.title for a in Article.search(session, query="cook", prefix=True)
+        ] == ["Cooking"]
+        assert Article.search(session, query='" OR') == []
+
+        # triggers keep index in sync
+        Article.update(session, values=dict(title="Baking"), title="Cooking")
+        Article.delete(session, title="Sharding", commit=True)
+        assert [a.title for a in Article.search(session, query="baking")] == ["Baking"]
+        assert [a.title for a in Article.search(session, query="databases")] == [
+            "Databases"
+        ]
+
+        Article.rebuild_search_index(session, commit=True)
+        assert len(Article.search(session, query="databases")) == 1
@@ -0,0 +1,66 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from sqlalchemy import DateTime, Integer, Numeric, String, Uuid, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from crudal import DeclarativeCrudBase, serialize
+
+
+class Payment(DeclarativeCrudBase):
+    __tablename__ = "payment"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    token: Mapped[uuid.UUID] = mapped_column(Uuid)
+    amount: Mapped[decimal.Decimal] = mapped_column(Numeric(10, 2))
+    paid_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=True)
+    comment: Mapped[str] = mapped_column(String, nullable=True)
+
+
+def test_to_dicts(sync_model, session: Session, random_string):
+    sync_model(name=random_string).add(session, commit=True)
+    found = sync_model.find(session, name=random_string)
+
+    assert sync_model.to_dicts(found) == [{"id": found[0].id, "name": random_string}]
+    assert sync_model.to_dicts(found, exclude=["id"]) == [{"name": random_string}]
+
+    # projected rows, streamed
+    rows = session.execute(
+        select(sync_model.name).where(sync_model.name == random_string)
+    )
+    assert sync_model.to_dicts(rows, fields=["name"]) == [{"name": random_string}]
+    assert sync_model.to_dicts(iter([{"id": 1, "name": "Andrew"}])) == [
+        {"id": 1, "name": "Andrew"}
+    ]
+    assert sync_model.to_dicts([]) == []
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_to_json_bytes(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(serialize, "orjson", None)
+
+    token = uuid.uuid4()
+    payments = [
+        Payment(
+            id=1,
+            token=token,
+            amount=decimal.Decimal("10.50"),
+            paid_at=datetime.datetime(2024, 1, 2, 3, 4, 5),
+            comment=None,
+        )
+    ]
+
+    data = json.loads(Payment.to_json_bytes(payments, exclude=["comment"]))
+    assert data == [
+        {
+            "id": 1,
+            "token": str(token),
+            "amount": "10.50",
+            "paid_at": "2024-01-02T03:04:05",
+        }
+    ]
+    assert Payment.to_json_bytes(payments, fields=["id"]) == b'[{"id":1}]'
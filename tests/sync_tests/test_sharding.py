@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy import Integer, String, create_engine, create_mock_engine
+from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
+
+from crudal import DeclarativeCrudBase
+from crudal.exceptions import VersionConflictError
+from crudal.operations import parse_order
+from crudal.sharding import HashShards, RangeShards, ShardSet, sort_items
+
+
+class ShardedPerson(DeclarativeCrudBase):
+    __tablename__ = "sharded_person"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class ShardedAccount(DeclarativeCrudBase):
+    __tablename__ = "sharded_account"
+    __version_column__ = "version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    region: Mapped[str] = mapped_column(String, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+
+@pytest.fixture
+def shard_sessions(tmp_path):
+    sessions = []
+    for i in range(2):
+        shard_engine = create_engine(f"sqlite:///{tmp_path / f'shard{i}.db'}")
+        DeclarativeCrudBase.metadata.create_all(bind=shard_engine)
+        sessions.append(sessionmaker(shard_engine, expire_on_commit=False))
+    yield sessions
+    ShardedPerson.__shards__ = ShardedAccount.__shards__ = None
+
+
+def test_hash_shards(shard_sessions):
+    ShardedPerson.__shards__ = HashShards("id", shard_sessions)
+    persons = [ShardedPerson(id=i, name=f"person{i}") for i in range(10)]
+    ShardedPerson.add_many(items=persons, commit=True)
+
+    # every row is stored in exactly one shard
+    per_shard = [len(ShardedPerson.all(s())) for s in shard_sessions]
+    assert sum(per_shard) == 10 and all(per_shard)
+
+    assert ShardedPerson.find_by_pk(pk=7).name == "person7"
+    assert ShardedPerson.exists(name="person3")
+    assert sorted(p.id for p in ShardedPerson.all()) == list(range(10))
+    assert len(ShardedPerson.find(rows=3, offset=8)) == 2
+
+    # shard results are merged in requested order
+    assert [p.id for p in ShardedPerson.find(rows=3, offset=2, order_by="-id")] == [
+        7,
+        6,
+        5,
+    ]
+    assert [p.id for p in ShardedPerson.all(order_by="id")] == list(range(10))
+
+
+def test_sort_items():
+    items = [{"a": 1, "b": None}, {"a": None, "b": 2}, {"a": 1, "b": 1}]
+    order = parse_order(["a nulls last", "-b"])
+    assert sort_items(items, order) == [
+        {"a": 1, "b": 1},
+        {"a": 1, "b": None},
+        {"a": None, "b": 2},
+    ]
+    # NULLs are smallest by default
+    assert sort_items(items, parse_order("-a"))[-1] == {"a": None, "b": 2}
+    # PostgreSQL sorts NULLs as largest
+    assert sort_items(items, parse_order("-a"), nulls_largest=True)[0] == {
+        "a": None,
+        "b": 2,
+    }
+    assert sort_items(items, parse_order("a"), nulls_largest=True)[-1] == {
+        "a": None,
+        "b": 2,
+    }
+
+
+def test_nulls_largest_by_dialect(shard_sessions):
+    postgres = create_mock_engine("postgresql://", executor=None)
+    shards = HashShards("id", [sessionmaker(postgres), sessionmaker(postgres)])
+    assert shards._nulls_largest()
+
+    assert not HashShards("id", shard_sessions)._nulls_largest()
+
+    mixed = HashShards("id", [shard_sessions[0], sessionmaker(postgres)])
+    with pytest.raises(ValueError):
+        mixed._nulls_largest()
+
+    # factory without bind argument
+    assert not HashShards("id", [lambda: shard_sessions[0]()])._nulls_largest()
+
+
+def test_shard_key_not_set(shard_sessions):
+    ShardedPerson.__shards__ = HashShards("id", shard_sessions)
+    with pytest.raises(ValueError, match="'id'"):
+        ShardedPerson(name="Andrew").add()
+
+    ShardedPerson.__shards__ = RangeShards(
+        "id", [(5, shard_sessions[0]), (None, shard_sessions[1])]
+    )
+    with pytest.raises(ValueError, match="'id'"):
+        ShardedPerson.add_many(items=[ShardedPerson(id=1, name="A"), {"id": None}])
+
+
+def test_range_shards(shard_sessions):
+    ShardedPerson.__shards__ = RangeShards(
+        "id", [(5, shard_sessions[0]), (None, shard_sessions[1])]
+    )
+    ShardedPerson(id=1, name="Andrew").add(commit=True)
+    ShardedPerson(id=10, name="Andrew").add(commit=True)
+
+    with shard_sessions[1]() as session:
+        assert [p.id for p in ShardedPerson.all(session)] == [10]
+
+    assert len(ShardedPerson.find(name="Andrew")) == 2
+    assert ShardedPerson.delete(id=10, commit=True)
+    assert [p.id for p in ShardedPerson.all()] == [1]
+
+    with pytest.raises(ValueError):
+        ShardedPerson.export(file="persons.csv")
+
+
+def test_versioned_update_on_all_shards(shard_sessions):
+    ShardedAccount.__shards__ = HashShards("region", shard_sessions)
+    ShardedAccount.add_many(
+        items=[ShardedAccount(id=i, region=f"r{i}") for i in range(4)], commit=True
+    )
+
+    # only shard holding the row updates it, other shards find nothing
+    result = ShardedAccount.update(values={"region": "r1"}, expected_version=1, id=3)
+    assert result.rowcount == 1
+
+    with pytest.raises(VersionConflictError):
+        ShardedAccount.update(values={"region": "r1"}, expected_version=5, id=3)
+
+
+def test_shard_set_is_abstract():
+    with pytest.raises(TypeError):
+        ShardSet("id", [lambda: None])
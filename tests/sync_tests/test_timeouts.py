@@ -0,0 +1,65 @@
+import time
+
+import pytest
+from sqlalchemy import Integer, text
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from crudal import DeclarativeCrudBase
+from crudal.exceptions import StatementTimeoutError
+from crudal.timeouts import statement_timeout
+
+ENDLESS = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c"
+)
+FINITE = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 10000) "
+    "SELECT count(*) FROM c"
+)
+
+
+class Job(DeclarativeCrudBase):
+    __tablename__ = "job"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    timeout: Mapped[int] = mapped_column(Integer)
+
+
+def test_statement_timeout(session: Session):
+    with pytest.raises(StatementTimeoutError):
+        with statement_timeout(session, 0.05):
+            session.execute(ENDLESS)
+    session.rollback()
+
+    # handler is removed with timeout scope
+    assert session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_statement_timeout_commit(session: Session):
+    with statement_timeout(session, 0.05):
+        session.execute(text("SELECT 1"))
+        session.commit()
+        time.sleep(0.1)
+
+        # connection returned to pool is not limited anymore
+        connection = session.get_bind().raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(FINITE)
+            assert cursor.fetchone()[0] == 10000
+        finally:
+            connection.close()
+
+
+def test_timeout_argument(sync_model, session: Session, random_string):
+    sync_model(name=random_string).add(session, commit=True)
+
+    assert len(sync_model.find(session, statement_timeout=5, name=random_string)) == 1
+    assert sync_model.exists(session, statement_timeout=5, name=random_string)
+
+
+def test_timeout_column_filter(session: Session):
+    Job.metadata.create_all(bind=session.get_bind(), tables=[Job.__table__])
+    Job.add_many(session, items=[Job(timeout=5), Job(timeout=10)], commit=True)
+
+    assert [job.timeout for job in Job.find(session, timeout=5)] == [5]
@@ -1,5 +1,8 @@
+import pytest
 from sqlalchemy.orm import Session
 
+from crudal.exceptions import VersionConflictError
+
 
 def test_update(sync_model, session: Session, random_string):
     p = sync_model(name="AndrewSON")
@@ -15,3 +18,71 @@ def test_update(sync_model, session: Session, random_string):
 
     assert len(p_new) == 1
     assert p.id == p_new[0].id
+
+
+def test_update_version_conflict(sync_versioned_model, session: Session):
+    a = sync_versioned_model(balance=10).add(session, commit=True)
+
+    sync_versioned_model.update(
+        session, values=dict(balance=20), expected_version=1, id=a.id
+    )
+    assert a.version == 2
+
+    with pytest.raises(VersionConflictError):
+        sync_versioned_model.update(
+            session, values=dict(balance=30), expected_version=1, id=a.id
+        )
+
+
+def test_update_expected_version_unversioned(sync_model, session: Session):
+    p = sync_model(name="Andrew").add(session, commit=True)
+
+    with pytest.raises(ValueError):
+        sync_model.update(
+            session, values=dict(name="John"), expected_version=1, id=p.id
+        )
+    assert sync_model.find_by_pk(session, pk=p.id).name == "Andrew"
+
+
+def test_update_many(sync_versioned_model, session: Session):
+    a1 = sync_versioned_model(balance=10).add(session, commit=True)
+    a2 = sync_versioned_model(balance=10).add(session, commit=True)
+
+    updated = sync_versioned_model.update_many(
+        session,
+        items=[
+            {"id": a1.id, "balance": 1, "version": 1},
+            {"id": a2.id, "balance": 2, "version": 1},
+        ],
+    )
+    assert updated == 2
+
+    with pytest.raises(VersionConflictError):
+        sync_versioned_model.update_many(
+            session, items=[{"id": a1.id, "balance": 3, "version": 1}]
+        )
+
+
+def test_update_many_invalid_items(sync_model, session: Session):
+    with pytest.raises(ValueError):
+        sync_model.update_many(session, items=[{"id": 1}])
+    with pytest.raises(ValueError):
+        sync_model.update_many(session, items=[{"id": 1, "nickname": "Bob"}])
+
+
+def test_update_with_retry(sync_versioned_model, session: Session):
+    a = sync_versioned_model(balance=10).add(session, commit=True)
+    calls = []
+
+    def change(account):
+        balance = account.balance
+        calls.append(balance)
+        if len(calls) == 1:
+            # concurrent writer
+            sync_versioned_model.update(session, values=dict(balance=15), id=a.id)
+        return dict(balance=balance + 1)
+
+    a = sync_versioned_model.update_with_retry(session, pk=a.id, change=change)
+
+    assert calls == [10, 15]
+    assert (a.balance, a.version) == (16, 3)